@@ -1,6 +1,11 @@
+from typing import Sequence
+
 import blake3
 from .hashing_interface import HashingInterface
 
+# Inputs at least this large are hashed with BLAKE3's multithreaded tree mode
+MULTITHREAD_THRESHOLD = 1 << 20
+
 class Blake3Hashing(HashingInterface):
     def hash(self, data: bytes, context: str) -> str:
         """Generate a BLAKE3 hash using a specific context."""
@@ -8,6 +13,16 @@ class Blake3Hashing(HashingInterface):
         hasher.update(data)
         return hasher.hexdigest()
 
+    def hash_parts(self, parts: Sequence[bytes], context: str) -> str:
+        """Generate a BLAKE3 hash over several byte chunks without concatenating them first."""
+        if sum(len(part) for part in parts) >= MULTITHREAD_THRESHOLD:
+            hasher = blake3.blake3(context.encode(), max_threads=blake3.blake3.AUTO)
+        else:
+            hasher = blake3.blake3(context.encode())
+        for part in parts:
+            hasher.update(part)
+        return hasher.hexdigest()
+
     def verify(self, data: bytes, context: str, hash_value: str) -> bool:
         """Verify that the generated hash matches the provided hash value."""
         expected_hash = self.hash(data, context)
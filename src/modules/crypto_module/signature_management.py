@@ -1,20 +1,56 @@
 from oqs import Signature
+import asyncio
 import base64
+import threading
+from functools import lru_cache
+from typing import List, Tuple, Union
+
+
+@lru_cache(maxsize=1024)
+def _decode_public_key(public_key: str) -> bytes:
+    """Decode a base64 public key; signers repeat, so decoded keys are cached."""
+    return base64.b64decode(public_key.encode())
+
+
+# liboqs contexts are not thread-safe, so each thread lazily gets its own Falcon-512
+# instance, which is then shared by every SignatureManagement on that thread
+_thread_local = threading.local()
+
+
+def _thread_falcon() -> Signature:
+    """Return the Falcon-512 context for the current thread, creating it on first use."""
+    falcon = getattr(_thread_local, 'falcon', None)
+    if falcon is None:
+        falcon = _thread_local.falcon = Signature("Falcon-512")
+    return falcon
+
 
 class SignatureManagement:
-    def __init__(self):
-        self._falcon = Signature("Falcon-512")
-    def sign_data(self, secret_key: str, data: str) -> str:
+    def sign_data(self, secret_key: str, data: Union[str, bytes]) -> str:
         """Sign the given data using Kyber-512 secret key."""
         sk = base64.b64decode(secret_key.encode())
-        signature = self._falcon.sign(data.encode())
+        message = data if isinstance(data, bytes) else data.encode()
+        signature = _thread_falcon().sign(message)
         return base64.b64encode(signature).decode()
 
-    def verify_signature(self, public_key: str, data: str, signature: str) -> bool:
+    def verify_signature(self, public_key: str, data: Union[str, bytes], signature: str) -> bool:
         """Verify the signature of the data using Kyber-512 public key."""
-        pk = base64.b64decode(public_key.encode())
+        pk = _decode_public_key(public_key)
         signature_bytes = base64.b64decode(signature.encode())
-        return self._falcon.verify(data.encode(), signature_bytes, pk)
+        message = data if isinstance(data, bytes) else data.encode()
+        return _thread_falcon().verify(message, signature_bytes, pk)
+
+    async def verify_signatures(self, items: List[Tuple[str, Union[str, bytes], str]]) -> List[bool]:
+        """Verify several (public_key, data, signature) triples concurrently, returning results in order.
+
+        Callers verifying the same message against many signers can pass it pre-encoded as bytes.
+        """
+        # Each executor thread verifies with its own Falcon context
+        loop = asyncio.get_running_loop()
+        return list(await asyncio.gather(*(
+            loop.run_in_executor(None, self.verify_signature, public_key, data, signature)
+            for public_key, data, signature in items
+        )))
 
 # Example usage:
 # signature_mgmt = SignatureManagement()
@@ -1,6 +1,11 @@
 import asyncio
-import json
 import hashlib
+import os
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Tuple
+from weakref import WeakSet
 from fastapi import HTTPException
 
 from nats.aio.client import Client as NATS
@@ -11,13 +16,32 @@ from logging import getLogger
 logger = getLogger(__name__)
 
 
+# hashlib releases the GIL for buffers larger than 2 KiB, so big audit batches
+# can be hashed on several cores at once.
+PARALLEL_HASH_MIN_BYTES = 2048
+PARALLEL_HASH_MIN_BATCH = 64
+
+# Shared by every large batch, so hashing never pays for starting and joining threads
+HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+
+
 def compute_hash(data: dict) -> str:
-    event_json = json.dumps(data, sort_keys=True).encode('utf-8')
-    return hashlib.sha256(event_json).hexdigest()
+    return hashlib.sha256(orjson.dumps(data, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _sha256_hex(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()
+
+
+def compute_hashes(datas: List[dict]) -> List[str]:
+    """Hash a batch of events for audit logging, in the same order as given."""
+    payloads = [orjson.dumps(data, option=orjson.OPT_SORT_KEYS) for data in datas]
+    if len(payloads) < PARALLEL_HASH_MIN_BATCH or sum(map(len, payloads)) < PARALLEL_HASH_MIN_BYTES * len(payloads):
+        return [_sha256_hex(payload) for payload in payloads]
+    return list(HASH_POOL.map(_sha256_hex, payloads))
 
 
 import asyncio
-import json
 import hashlib
 from fastapi import HTTPException
 import aiohttp
@@ -29,7 +53,19 @@ from logging import getLogger
 logger = getLogger(__name__)
 
 
+@lru_cache(maxsize=1024)
+def _event_subject(event_type: str) -> str:
+    return f"events.{event_type}"
+
+
 class EventEmitter:
+    # Pre-encoded pieces of the {"data": ..., "ipfs_hash": ...} publish envelope
+    _ENVELOPE_PREFIX = b'{"data":'
+    _ENVELOPE_MID = b',"ipfs_hash":'
+    _ENVELOPE_SUFFIX = b'}'
+    # Live emitters, so teardown can close all of them together
+    _instances: "WeakSet[EventEmitter]" = WeakSet()
+
     def __init__(self, nats_server="nats://localhost:4222"):
         self.nats_client = NATS()
         self.nats_server = nats_server
@@ -37,6 +73,12 @@ class EventEmitter:
         self.ipfs_client = None
         self.http_session = None
         self._setup_done = False
+        EventEmitter._instances.add(self)
+
+    @classmethod
+    def instances(cls) -> List["EventEmitter"]:
+        """Emitters that are still alive."""
+        return list(cls._instances)
 
     async def _setup(self):
         if not self._setup_done:
@@ -50,27 +92,44 @@ class EventEmitter:
     async def emit_event(self, event_type: str, data: dict) -> None:
         await self._setup()
         ipfs_hash = await self.ipfs_client.add_json(data)
+        await self.jetstream.publish(_event_subject(event_type), self._encode_envelope(data, ipfs_hash))
+
+    def _encode_envelope(self, data: dict, ipfs_hash) -> bytes:
+        """Encode the publish envelope by splicing pre-encoded bytes instead of building a dict."""
+        return b"".join((
+            self._ENVELOPE_PREFIX, orjson.dumps(data),
+            self._ENVELOPE_MID, orjson.dumps(ipfs_hash),
+            self._ENVELOPE_SUFFIX,
+        ))
+
+    async def emit_events(self, events: List[Tuple[str, dict]]) -> None:
+        """Emit a batch of (event_type, data) events, pinning them to IPFS concurrently."""
+        if not events:
+            return
+        await self._setup()
+        ipfs_hashes = await asyncio.gather(*(self.ipfs_client.add_json(data) for _, data in events))
 
-        event = {
-            "data": data,
-            "ipfs_hash": ipfs_hash,
-        }
-
-        subject = f"events.{event_type}"
-        message = json.dumps(event).encode('utf-8')
-        await self.jetstream.publish(subject, message)
+        for (event_type, data), ipfs_hash in zip(events, ipfs_hashes):
+            await self.jetstream.publish(_event_subject(event_type), self._encode_envelope(data, ipfs_hash))
 
     async def cleanup(self):
         """Cleanup resources properly."""
         try:
+            # The connections are independent, so close them concurrently
+            closers = []
             if self.nats_client and self.nats_client.is_connected:
-                await self.nats_client.close()
+                closers.append(self.nats_client.close())
 
             if self.ipfs_client:
-                await self.ipfs_client.close()
+                closers.append(self.ipfs_client.close())
 
             if self.http_session:
-                await self.http_session.close()
+                closers.append(self.http_session.close())
+
+            results = await asyncio.gather(*closers, return_exceptions=True)
+            errors = [result for result in results if isinstance(result, Exception)]
+            if errors:
+                raise errors[0]
 
             self._setup_done = False
             logger.info("EventEmitter cleanup completed")
@@ -1,20 +1,53 @@
+import asyncio
+from logging import getLogger
+
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from event_emitter import EventEmitter
 from contextlib import asynccontextmanager
 
+logger = getLogger(__name__)
+
+EVENT_QUEUE_SIZE = 10_000
+EVENT_WORKERS = 4
+EVENT_BATCH_SIZE = 64
+
 # Instantiate the EventEmitter
 emitter = EventEmitter()
 
+# Events accepted by the API and waiting to be published
+event_queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+
+
+async def event_worker():
+    """Drain the event queue and publish events in batches."""
+    while True:
+        batch = [await event_queue.get()]
+        while len(batch) < EVENT_BATCH_SIZE and not event_queue.empty():
+            batch.append(event_queue.get_nowait())
+        try:
+            await emitter.emit_events(batch)
+        except Exception as e:
+            logger.error(f"Failed to emit {len(batch)} events: {e}")
+        finally:
+            for _ in batch:
+                event_queue.task_done()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: Connect the EventEmitter
     await emitter.connect()
+    workers = [asyncio.create_task(event_worker()) for _ in range(EVENT_WORKERS)]
 
     # Yield control back to the app to handle incoming requests
     yield
 
-    # Shutdown: Close the EventEmitter connections
+    # Shutdown: Flush pending events, stop the workers and close the EventEmitter connections
+    await event_queue.join()
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
     await emitter.nats_client.close()
 
 # Instantiate the FastAPI app and pass the lifespan context manager
@@ -28,13 +61,13 @@ class EventData(BaseModel):
 @app.post("/emit_event")
 async def emit_event(event: EventData):
     """
-    Endpoint to emit a new event.
+    Endpoint to emit a new event. The event is queued and published in the background.
     """
     try:
-        await emitter.emit_event(event.event_type, event.data)
-        return {"status": "Event emitted successfully"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        event_queue.put_nowait((event.event_type, event.data))
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Event queue is full")
+    return {"status": "Event queued for emission"}
 
 @app.get("/latest_event/{event_type}")
 async def get_latest_event(event_type: str):
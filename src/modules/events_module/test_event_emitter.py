@@ -4,7 +4,7 @@ import pytest
 import pytest_asyncio
 import json
 from unittest.mock import AsyncMock, patch
-from .event_emitter import EventEmitter
+from .event_emitter import EventEmitter, compute_hash, compute_hashes
 
 
 @pytest_asyncio.fixture
@@ -58,3 +58,9 @@ async def test_retrieve_event_history(event_emitter):
     result = await event_emitter.retrieve_event_history("QmHash")
     assert result == {"mocked": "data"}
     event_emitter.ipfs_client.get_json.assert_called_once_with("QmHash")
+
+
+def test_compute_hashes_matches_compute_hash():
+    events = [{"message": "Hello, world!", "seq": i} for i in range(3)]
+    events.append({"blob": "x" * 4096})
+    assert compute_hashes(events) == [compute_hash(event) for event in events]
@@ -46,3 +46,30 @@ class EntanglementEntropy(EntanglementInterface):
         eigenvalues = np.clip(np.real(np.linalg.eigvals(regularized_matrix)), 1e-10, None)
         entropy = -np.sum(eigenvalues * np.log(eigenvalues))
         return entropy
+
+    def calculate_entropies(self, density_matrices, epsilon: float = 1e-5, threshold: float = 1e-9) -> np.ndarray:
+        """
+        Calculate the entropy of many same-sized density matrices in one batched pass.
+
+        Parameters:
+            density_matrices: Sequence or array of shape (B, d, d).
+            epsilon (float): Small positive value for regularization.
+            threshold (float): Minimum eigenvalue threshold for stability.
+
+        Returns:
+            np.ndarray: Array of B entropies, matching calculate_entropy per matrix.
+        """
+        matrices = np.asarray(density_matrices)
+        regularized = matrices + np.eye(matrices.shape[-1]) * epsilon
+
+        # Stacked eigendecomposition: one LAPACK dispatch for the whole batch
+        eigenvalues, eigenvectors = np.linalg.eigh(regularized)
+        eigenvalues = np.maximum(eigenvalues, threshold)
+        regularized = (eigenvectors * eigenvalues[:, np.newaxis, :]) @ np.swapaxes(eigenvectors, -1, -2)
+
+        regularized = np.clip(regularized, -1e10, 1e10)
+        regularized = np.nan_to_num(regularized, nan=epsilon, posinf=epsilon, neginf=epsilon)
+
+        # The regularized matrices are symmetric, so the Hermitian solver applies
+        eigenvalues = np.clip(np.linalg.eigvalsh(regularized), 1e-10, None)
+        return -np.sum(eigenvalues * np.log(eigenvalues), axis=-1)
@@ -1,21 +1,36 @@
 import asyncio
-import json
 import logging
-import pickle
-from typing import Dict, Tuple
+import struct
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
+import msgpack
 import numpy as np
+import orjson
 from aioipfs import AsyncIPFS
 from ..zkp.qzkp_optimized import QuantumZKP
 from ..events_module.event_emitter import EventEmitter
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from oqs import Signature, KeyEncapsulation  # Import Falcon from oqs-python
 from ..crypto_module.blake3_hashing import Blake3Hashing  # Import Blake3Hashing for hashing
 import os
 
 logger = logging.getLogger(__name__)
 
+GCM_IV_SIZE = 12
+GCM_TAG_SIZE = 16
+
+# Transaction events are flushed to the emitter in batches of up to this many, or after this many seconds
+EVENT_FLUSH_BATCH = 64
+EVENT_FLUSH_INTERVAL = 0.01
+
+
+@lru_cache(maxsize=256)
+def _get_aesgcm(key: bytes) -> AESGCM:
+    """Return a cached AES-GCM context for the given shared key."""
+    return AESGCM(key)
+
 
 class TransactionManager:
     def __init__(self, dimensions: int = 8, security_level: int = 128):
@@ -23,31 +38,54 @@ class TransactionManager:
         self.event_emitter = EventEmitter()  # Instantiate EventEmitter
         self.zkp = QuantumZKP(dimensions, security_level)
         self.kyber = KeyEncapsulation('Kyber512')# Initialize Kyber512 for key exchange
+        self._kyber_lock = threading.Lock()  # KeyEncapsulation keeps the generated keypair as object state
         self.hasher = Blake3Hashing()  # Initialize Blake3Hashing for hashing needs
+        self._event_queue: Optional[asyncio.Queue] = None
+        self._event_flush_task: Optional[asyncio.Task] = None
         logger.info("TransactionManager initialized with IPFS and encrypted storage using Kyber key exchange.")
 
+    @staticmethod
+    def _msgpack_default(obj: Any) -> Any:
+        """msgpack encoder for the NumPy and complex values found in ZKP proofs."""
+        if isinstance(obj, complex):
+            return {'real': obj.real, 'imag': obj.imag}
+        elif isinstance(obj, (np.integer, np.floating)):
+            return obj.item()
+        elif isinstance(obj, np.ndarray):
+            if obj.dtype.names:
+                # Record arrays such as proof measurements keep their field names
+                return [dict(zip(obj.dtype.names, row)) for row in obj.tolist()]
+            return obj.tolist()
+        raise TypeError(f"Object of type {obj.__class__.__name__} is not msgpack serializable")
+
+    def _pack(self, data: Dict) -> bytes:
+        """Serialize a transaction envelope to msgpack, keeping bytes values raw."""
+        return msgpack.packb(data, use_bin_type=True, default=self._msgpack_default)
+
+    @staticmethod
+    def _unpack(data: bytes) -> Dict:
+        """Deserialize a msgpack transaction envelope."""
+        return msgpack.unpackb(data, raw=False)
+
     def _encrypt_data(self, data: bytes, key: bytes) -> bytes:
         """Encrypt data with AES-GCM for confidentiality and integrity."""
-        iv = os.urandom(12)  # AES-GCM requires a 12-byte IV
-        cipher = Cipher(algorithms.AES(key), modes.GCM(iv), backend=default_backend())
-        encryptor = cipher.encryptor()
-        encrypted_data = encryptor.update(data) + encryptor.finalize()
-        return iv + encryptor.tag + encrypted_data  # Concatenate IV, tag, and encrypted data
+        iv = os.urandom(GCM_IV_SIZE)  # AES-GCM requires a 12-byte IV
+        sealed = _get_aesgcm(key).encrypt(iv, data, None)  # ciphertext || tag
+        return iv + sealed[-GCM_TAG_SIZE:] + sealed[:-GCM_TAG_SIZE]  # Concatenate IV, tag, and encrypted data
 
     def _decrypt_data(self, encrypted_data: bytes, key: bytes) -> bytes:
         """Decrypt data with AES-GCM."""
-        iv = encrypted_data[:12]
-        tag = encrypted_data[12:28]
-        cipher_text = encrypted_data[28:]
-        cipher = Cipher(algorithms.AES(key), modes.GCM(iv, tag), backend=default_backend())
-        decryptor = cipher.decryptor()
-        return decryptor.update(cipher_text) + decryptor.finalize()
+        iv = encrypted_data[:GCM_IV_SIZE]
+        tag = encrypted_data[GCM_IV_SIZE:GCM_IV_SIZE + GCM_TAG_SIZE]
+        cipher_text = encrypted_data[GCM_IV_SIZE + GCM_TAG_SIZE:]
+        return _get_aesgcm(key).decrypt(iv, cipher_text + tag, None)
 
     def _derive_shared_key(self, user_private_key: bytes, recipient_public_key: bytes) -> Tuple[bytes, bytes, bytes]:
         """Derive a shared encryption key using Kyber key encapsulation."""
         try:
-            user_public_key, ephemeral_private_key = self.kyber.generate_keypair()
-            shared_key, ciphertext = self.kyber.encapsulate(recipient_public_key)
+            with self._kyber_lock:
+                user_public_key = self.kyber.generate_keypair()
+                ciphertext, shared_key = self.kyber.encap_secret(recipient_public_key)
             return shared_key, ciphertext, user_public_key
         except Exception as e:
             logger.error(f"Failed to derive shared key with Kyber: {e}")
@@ -58,34 +96,37 @@ class TransactionManager:
         transaction_id = self._generate_transaction_id(transaction_data)
         latent_vector_layer = self._create_latent_vector_layer(transaction_data)
 
-        commitment, proof = self.zkp.prove_vector_knowledge(latent_vector_layer, transaction_id)
-        transaction_data["commitment"] = pickle.dumps(commitment).hex()
-        transaction_data["proof"] = pickle.dumps(proof).hex()
+        # Prove and derive the Kyber shared key concurrently; neither depends on the other
+        (commitment, proof), (shared_key, ciphertext, user_public_key) = await asyncio.gather(
+            self.zkp.prove_vector_knowledge(latent_vector_layer, transaction_id),
+            asyncio.to_thread(self._derive_shared_key, user_private_key, recipient_public_key)
+        )
+        transaction_data["commitment"] = commitment
+        transaction_data["proof"] = proof
         transaction_data["confirmed"] = False
 
-        # Convert transaction data to JSON
-        plaintext_data = json.dumps(transaction_data).encode('utf-8')
-
-        # Derive shared encryption key using Kyber key exchange
-        shared_key, ciphertext, user_public_key = self._derive_shared_key(user_private_key, recipient_public_key)
+        # Serialize transaction data, commitment and proof into a single msgpack envelope
+        plaintext_data = self._pack(transaction_data)
 
         # Encrypt transaction data with shared key
         encrypted_data = self._encrypt_data(plaintext_data, shared_key)
 
-        # Store encrypted transaction data on IPFS
-        cid = await self.ipfs_client.add_bytes(encrypted_data)
-
         # Prepare and encrypt metadata
         metadata = {
-            "user_public_key": user_public_key.hex(),
-            "ciphertext": ciphertext.hex()
+            "user_public_key": user_public_key,
+            "ciphertext": ciphertext
         }
-        metadata_plaintext = json.dumps(metadata).encode('utf-8')
+        metadata_plaintext = self._pack(metadata)
         encrypted_metadata = self._encrypt_data(metadata_plaintext, shared_key)
-        metadata_cid = await self.ipfs_client.add_bytes(encrypted_metadata)
+
+        # Store encrypted transaction data and metadata on IPFS concurrently
+        cid, metadata_cid = await asyncio.gather(
+            self.ipfs_client.add_bytes(encrypted_data),
+            self.ipfs_client.add_bytes(encrypted_metadata)
+        )
 
         # Emit event for stored transaction
-        await self.event_emitter.emit_event("transaction_stored", {"transaction_id": cid, "metadata_cid": metadata_cid})
+        await self._emit_event("transaction_stored", {"transaction_id": cid, "metadata_cid": metadata_cid})
         logger.info(f"Transaction {transaction_id} stored on IPFS with CID {cid}.")
 
         return cid, metadata_cid
@@ -95,7 +136,7 @@ class TransactionManager:
         try:
             encrypted_metadata = await self.ipfs_client.cat(metadata_cid)
             metadata_plaintext = self._decrypt_data(encrypted_metadata, shared_key)
-            metadata = json.loads(metadata_plaintext.decode('utf-8'))
+            metadata = self._unpack(metadata_plaintext)
             logger.info(f"Retrieved transaction metadata from IPFS with CID {metadata_cid}.")
             return metadata
         except Exception as e:
@@ -104,20 +145,22 @@ class TransactionManager:
 
     async def confirm_transaction(self, transaction_id: str, metadata_cid: str, recipient_private_key: bytes) -> None:
         """Confirm the transaction by updating its status on IPFS and move it to the transaction layer."""
-        # Retrieve encrypted transaction data from IPFS
-        encrypted_data = await self.ipfs_client.cat(transaction_id)
-
-        # Retrieve transaction metadata and derive shared key using recipient's private key
-        transaction_metadata = await self.retrieve_transaction_metadata(metadata_cid, recipient_private_key)
-        ciphertext = bytes.fromhex(transaction_metadata["ciphertext"])
+        # Retrieve encrypted transaction data and its metadata from IPFS concurrently
+        encrypted_data, transaction_metadata = await asyncio.gather(
+            self.ipfs_client.cat(transaction_id),
+            self.retrieve_transaction_metadata(metadata_cid, recipient_private_key)
+        )
+
+        # Derive shared key using recipient's private key
+        ciphertext = transaction_metadata["ciphertext"]
         shared_key = self.kyber.decapsulate(ciphertext, recipient_private_key)
 
         # Decrypt transaction data
         plaintext_data = self._decrypt_data(encrypted_data, shared_key)
-        transaction_data = json.loads(plaintext_data.decode('utf-8'))
+        transaction_data = self._unpack(plaintext_data)
 
-        commitment = pickle.loads(bytes.fromhex(transaction_data['commitment']))
-        proof = pickle.loads(bytes.fromhex(transaction_data['proof']))
+        commitment = transaction_data['commitment']
+        proof = transaction_data['proof']
 
         # Verify proof before confirmation
         if not self.zkp.verify_proof(commitment, proof, transaction_id):
@@ -129,14 +172,14 @@ class TransactionManager:
 
         # Mark transaction as confirmed and re-encrypt the data
         transaction_data['confirmed'] = True
-        new_plaintext_data = json.dumps(transaction_data).encode('utf-8')
+        new_plaintext_data = self._pack(transaction_data)
         new_encrypted_data = self._encrypt_data(new_plaintext_data, shared_key)
 
         # Store the updated encrypted data on IPFS
         new_cid = await self.ipfs_client.add_bytes(new_encrypted_data)
 
         # Emit event for confirmed transaction
-        await self.event_emitter.emit_event("transaction_confirmed", {"transaction_id": new_cid})
+        await self._emit_event("transaction_confirmed", {"transaction_id": new_cid})
         logger.info(f"Transaction {transaction_id} confirmed and updated on IPFS with new CID {new_cid}.")
 
     def _update_vector_layers(self, transaction_id: str) -> None:
@@ -151,20 +194,22 @@ class TransactionManager:
 
     async def retrieve_transaction(self, transaction_id: str, metadata_cid: str, recipient_private_key: bytes) -> Dict:
         """Retrieve and decrypt a stored transaction from IPFS using Kyber-derived shared key."""
-        # Retrieve encrypted transaction data from IPFS
-        encrypted_data = await self.ipfs_client.cat(transaction_id)
-
-        # Retrieve transaction metadata and decrypt shared key using recipient's private key
-        transaction_metadata = await self.retrieve_transaction_metadata(metadata_cid, recipient_private_key)
-        ciphertext = bytes.fromhex(transaction_metadata["ciphertext"])
+        # Retrieve encrypted transaction data and its metadata from IPFS concurrently
+        encrypted_data, transaction_metadata = await asyncio.gather(
+            self.ipfs_client.cat(transaction_id),
+            self.retrieve_transaction_metadata(metadata_cid, recipient_private_key)
+        )
+
+        # Decrypt shared key using recipient's private key
+        ciphertext = transaction_metadata["ciphertext"]
         shared_key = self.kyber.decapsulate(ciphertext, recipient_private_key)
 
         # Decrypt the data
         plaintext_data = self._decrypt_data(encrypted_data, shared_key)
-        transaction_data = json.loads(plaintext_data.decode('utf-8'))
+        transaction_data = self._unpack(plaintext_data)
 
-        commitment = pickle.loads(bytes.fromhex(transaction_data['commitment']))
-        proof = pickle.loads(bytes.fromhex(transaction_data['proof']))
+        commitment = transaction_data['commitment']
+        proof = transaction_data['proof']
 
         if not transaction_data['confirmed']:
             raise ValueError("Transaction is not confirmed yet.")
@@ -174,15 +219,32 @@ class TransactionManager:
             logger.error(f"Proof verification failed for transaction {transaction_id}.")
             raise ValueError("Proof verification failed. Retrieval denied.")
 
-        await self.event_emitter.emit_event("transaction_retrieved", {"transaction_id": transaction_id})
+        await self._emit_event("transaction_retrieved", {"transaction_id": transaction_id})
         logger.info(f"Transaction {transaction_id} retrieved successfully from IPFS.")
 
         return transaction_data
 
     def _generate_transaction_id(self, transaction_data: Dict) -> str:
         """Generate a unique transaction ID based on transaction data using Blake3."""
-        data_bytes = json.dumps(transaction_data, sort_keys=True).encode('utf-8')
-        return self.hasher.hash(data_bytes, context="transaction_id")
+        return self.hasher.hash_parts(self._canonical_fields(transaction_data), context="transaction_id")
+
+    @staticmethod
+    def _canonical_fields(transaction_data: Dict) -> list:
+        """Encode transaction fields in sorted key order as length-prefixed byte chunks."""
+        parts = []
+        for key in sorted(transaction_data):
+            value = transaction_data[key]
+            if isinstance(value, float):
+                encoded = b'f' + struct.pack('<d', value)
+            elif isinstance(value, int) and not isinstance(value, bool) and -(1 << 63) <= value < (1 << 63):
+                encoded = b'i' + struct.pack('<q', value)
+            else:
+                encoded = b'j' + orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+            key_bytes = key.encode('utf-8')
+            parts.append(struct.pack('<II', len(key_bytes), len(encoded)))
+            parts.append(key_bytes)
+            parts.append(encoded)
+        return parts
 
     def _create_latent_vector_layer(self, transaction_data: Dict) -> np.ndarray:
         """Create a latent vector layer from numerical transaction data."""
@@ -195,8 +257,47 @@ class TransactionManager:
         await self.ipfs_client.close()
         logger.info("IPFS client connection closed.")
 
+    async def _emit_event(self, event_type: str, data: Dict) -> None:
+        """Queue an event for the background flusher, or emit it directly when the manager is not started."""
+        if self._event_flush_task is None:
+            await self.event_emitter.emit_event(event_type, data)
+        else:
+            self._event_queue.put_nowait((event_type, data))
+
+    async def _flush_events(self) -> None:
+        """Drain queued events and hand them to the emitter in batches."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._event_queue.get()]
+            deadline = loop.time() + EVENT_FLUSH_INTERVAL
+            while len(batch) < EVENT_FLUSH_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._event_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self.event_emitter.emit_events(batch)
+            except Exception as e:
+                logger.error(f"Failed to emit {len(batch)} transaction events: {e}")
+            finally:
+                for _ in batch:
+                    self._event_queue.task_done()
+
     async def stop(self):
-        pass
+        if self._event_flush_task is None:
+            return
+        # Flush whatever is still queued before stopping the flusher
+        await self._event_queue.join()
+        self._event_flush_task.cancel()
+        await asyncio.gather(self._event_flush_task, return_exceptions=True)
+        self._event_flush_task = None
+        self._event_queue = None
 
     async def start(self):
-        pass
+        if self._event_flush_task is not None:
+            return
+        self._event_queue = asyncio.Queue()
+        self._event_flush_task = asyncio.create_task(self._flush_events())
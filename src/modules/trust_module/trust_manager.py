@@ -1,10 +1,15 @@
 from src.modules.trust_module.trust_manager_interface import TrustManagerInterface
-from typing import Dict
+from typing import Dict, List
 import math
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Equal weighting of uptime, latency, age, peer recognition and stability
+TRUST_WEIGHTS = np.full(5, 0.2)
+
 class TrustManager(TrustManagerInterface):
     def __init__(self, decay_factor: float = 0.95):
         self.decay_factor = decay_factor
@@ -30,6 +35,44 @@ class TrustManager(TrustManagerInterface):
         logger.debug(f"Calculated trust score: {trust_score} for node: {node_data.get('id')}")
         return trust_score
 
+    def calculate_trust_scores(self, uptimes, latencies, ages, peer_recognition, stability) -> np.ndarray:
+        """Calculate trust scores for many nodes at once.
+
+        Each argument is a 1-D array with one entry per node; the result matches
+        calling calculate_trust_score on every node individually.
+        """
+        ages = np.asarray(ages, dtype=np.float64)
+        inflated_age_scores = np.minimum(1.0, ages * 0.1 * np.power(1.021416, ages))
+        stack = np.stack([
+            np.asarray(uptimes, dtype=np.float64),
+            1.0 - np.asarray(latencies, dtype=np.float64),
+            inflated_age_scores,
+            np.asarray(peer_recognition, dtype=np.float64),
+            np.asarray(stability, dtype=np.float64),
+        ], axis=1)
+        return np.einsum('j,ij->i', TRUST_WEIGHTS, stack)
+
+    def update_trust_scores(self, nodes: Dict[str, Dict]) -> None:
+        """Update the trust scores of many nodes in a single vectorized pass."""
+        node_ids: List[str] = list(nodes)
+        if not node_ids:
+            return
+        node_data = [nodes[node_id] for node_id in node_ids]
+        scores = self.calculate_trust_scores(
+            [d.get("uptime", 0.0) for d in node_data],
+            [d.get("latency", 1.0) for d in node_data],
+            [d.get("age", 0.0) for d in node_data],
+            [d.get("peer_recognition", 0.0) for d in node_data],
+            [d.get("stability", 0.0) for d in node_data],
+        )
+
+        for node_id, trust_score in zip(node_ids, scores.tolist()):
+            self.node_trust_scores[node_id] = trust_score
+            if trust_score < 0:
+                self.ban_node(node_id)
+
+        logger.info(f"Updated trust scores for {len(node_ids)} nodes")
+
     def ban_node(self, node_id: str) -> None:
         """Ban a node from the network by setting its trust score to a negative value."""
         if node_id in self.node_trust_scores:
@@ -3,6 +3,8 @@
 from abc import ABC, abstractmethod
 
 class LayerInterface(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def get_data(self):
         """Retrieve data for this layer."""
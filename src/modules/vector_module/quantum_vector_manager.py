@@ -63,7 +63,8 @@ class QuantumVectorManager:
             raise Exception(f"Vector ID '{vector_id}' already exists. Creation aborted.")# Return the existing vector or handle it differently
 
                  # Normalize the input coordinates and create a new vector
-        normalized_coords = np.array(coordinates) / np.linalg.norm(coordinates)
+        coords = np.asarray(coordinates, dtype=np.float64)
+        normalized_coords = coords / np.linalg.norm(coords)
         new_vector = TransactionVector()
         new_vector.add_layer("Coordinates", normalized_coords)
         new_vector.add_layer("State", {
@@ -127,7 +128,8 @@ class QuantumVectorManager:
             return False
 
         vector = self.vectors[vector_id]
-        normalized_coords = np.array(new_coordinates) / np.linalg.norm(new_coordinates)
+        coords = np.asarray(new_coordinates, dtype=np.float64)
+        normalized_coords = coords / np.linalg.norm(coords)
         vector.add_layer("Coordinates", normalized_coords)
         vector.add_layer("State", {**new_state, "timestamp": time.time()})
         logger.info(f"Vector {vector_id} updated to new state.")
@@ -2,11 +2,23 @@
 
 from .interfaces.layer_interface import LayerInterface
 
+_NOT_DECODED = object()
+
+
 class TransactionLayer(LayerInterface):
+    __slots__ = ("data", "_decoded")
+
     def __init__(self, data):
         """Initialize a layer with specific transaction data."""
         self.data = data
+        self._decoded = _NOT_DECODED
 
     def get_data(self):
         """Retrieve data for this layer."""
         return self.data
+
+    def get_data_decoded(self, decode):
+        """Retrieve the deserialized data for this layer, decoding it only on first access."""
+        if self._decoded is _NOT_DECODED:
+            self._decoded = decode(self.data)
+        return self._decoded
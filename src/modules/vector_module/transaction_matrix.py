@@ -1,27 +1,41 @@
 # /transaction_matrix.py
 
+import logging
+
+import numpy as np
+
 from .interfaces.matrix_interface import MatrixInterface
 from .transaction_vector import TransactionVector
 
+logger = logging.getLogger(__name__)
+
 class TransactionMatrix(MatrixInterface):
     def __init__(self, row_criteria, col_criteria):
         """Initialize a matrix with rows and columns organized by specific criteria."""
-        self.matrix = [[TransactionVector() for _ in col_criteria] for _ in row_criteria]
         self.row_criteria = row_criteria  # E.g., time periods (months, years)
         self.col_criteria = col_criteria  # E.g., transaction types (payment, deposit, transfer)
+        # Criteria -> position lookups, so cells are found without scanning the criteria lists
+        self._row_idx = {key: i for i, key in enumerate(row_criteria)}
+        self._col_idx = {key: i for i, key in enumerate(col_criteria)}
+        # Cells live in a 2-D object array so rows and columns can be sliced for bulk operations
+        self.matrix = np.empty((len(row_criteria), len(col_criteria)), dtype=object)
+        for row in range(len(row_criteria)):
+            for col in range(len(col_criteria)):
+                self.matrix[row, col] = TransactionVector()
+
+    def _cell_index(self, row_key, col_key):
+        """Resolve a (row_key, col_key) pair to its (row, col) position in the matrix."""
+        return self._row_idx[row_key], self._col_idx[col_key]
 
     def add_transaction(self, row_key, col_key, layer_name, data):
         """Add transaction data to a specific vector in the matrix."""
-        row = self.row_criteria.index(row_key)
-        col = self.col_criteria.index(col_key)
-        self.matrix[row][col].add_layer(layer_name, data)
-        print(f"Transaction added to ({row_key}, {col_key}) in layer '{layer_name}'.")
+        self.matrix[self._cell_index(row_key, col_key)].add_layer(layer_name, data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Transaction added to (%s, %s) in layer '%s'.", row_key, col_key, layer_name)
 
     def get_transaction_vector(self, row_key, col_key) -> TransactionVector:
         """Retrieve the transaction vector at a specific matrix cell."""
-        row = self.row_criteria.index(row_key)
-        col = self.col_criteria.index(col_key)
-        return self.matrix[row][col]
+        return self.matrix[self._cell_index(row_key, col_key)]
 
     def query_layer(self, row_key, col_key, layer_name):
         """Query a specific layer in a specific transaction vector."""
@@ -1,40 +1,75 @@
 # vector_module/transaction_protocol.py
 
 import hashlib
+import itertools
+import secrets
+import threading
 import time
 import logging
+from collections import deque
 from typing import List, Optional
+
+import blake3
 from vector_module.quantum_vector_manager import QuantumVectorManager
 from vector_module.transaction_matrix import TransactionMatrix
 
 logger = logging.getLogger(__name__)
 
+# Hash functions available for transaction IDs. IDs only key double-spend checks, so the
+# faster BLAKE3 is the default; SHA-256 remains available for audit chains that require it.
+TX_ID_HASHES = {
+    "blake3": blake3.blake3,
+    "sha256": hashlib.sha256,
+}
+
+# Number of per-sender hasher midstates kept for transaction ID derivation
+SENDER_CACHE_SIZE = 4096
+
+# Vectors hash onto this many striped locks, so lock memory stays fixed however many vectors are touched
+VECTOR_LOCK_STRIPES = 64
+
 class TransactionProtocol:
-    def __init__(self, vector_manager: QuantumVectorManager, transaction_matrix: TransactionMatrix):
+    def __init__(self, vector_manager: QuantumVectorManager, transaction_matrix: TransactionMatrix,
+                 tx_id_hash: str = "blake3"):
         # Initialize with a reference to QuantumVectorManager and TransactionMatrix
         self.vector_manager = vector_manager
         self.transaction_matrix = transaction_matrix
-        # List to store pending transactions
-        self.pending_transactions = []
-        # Set to store processed transaction IDs (for double-spend prevention)
+        if tx_id_hash not in TX_ID_HASHES:
+            raise ValueError(f"Unsupported transaction ID hash: {tx_id_hash}")
+        self._tx_id_hasher = TX_ID_HASHES[tx_id_hash]
+        # Transaction IDs hash a per-process random nonce and a monotonic counter
+        self._tx_nonce = secrets.token_bytes(8)
+        self._tx_counter = itertools.count()
+        # sender -> hasher that has already absorbed the sender bytes; cloned per transaction
+        self._sender_cache = {}
+        # Queue of pending transactions; producers append while the processor drains
+        self.pending_transactions = deque()
+        self._pending_lock = threading.Lock()
+        # Set of processed raw transaction digests (for double-spend prevention)
         self.processed_transactions = set()
-        # Dictionary to track locked vectors
-        self.locked_vectors = set()
+        # Striped per-vector locks so transactions on distinct vectors can be processed concurrently
+        self._vector_locks = [threading.Lock() for _ in range(VECTOR_LOCK_STRIPES)]
         logger.info("TransactionProtocol initialized")
 
     def create_transaction(self, tx_type: str, sender: str, vector_data: Optional[List[float]] = None, **kwargs):
-        # Generate a unique transaction ID
-        tx_id = hashlib.sha256(f"{sender}{time.time()}".encode()).hexdigest()
-        signature = hashlib.sha256(f"{tx_id}{sender}".encode()).hexdigest()
+        # Generate a unique transaction ID; the raw digest is kept so it is never re-hashed
+        sender_bytes = sender.encode('utf-8')
+        tx_hasher = self._sender_hasher(sender, sender_bytes).copy()
+        tx_hasher.update(self._tx_nonce)
+        tx_hasher.update(next(self._tx_counter).to_bytes(8, 'little'))
+        tx_hash = tx_hasher.digest()
+        tx_id = tx_hash.hex()
+        signature = hashlib.sha256(tx_hash + sender_bytes).hexdigest()
 
         # Check if a transaction with this ID or affecting the same vector has already been processed
-        if tx_id in self.processed_transactions:
+        if tx_hash in self.processed_transactions:
             logger.warning(f"Double-spend attempt detected: Transaction {tx_id} already processed.")
             return {"error": "Double-spend attempt detected: Transaction already processed."}
 
         # Add the transaction to pending_transactions for processing
         transaction = {
             "tx_id": tx_id,
+            "tx_hash": tx_hash,
             "tx_type": tx_type,
             "sender": sender,
             "vector_data": vector_data,
@@ -46,40 +81,44 @@ class TransactionProtocol:
         logger.info(f"Transaction {tx_id} of type {tx_type} created.")
         return transaction
 
+    def _sender_hasher(self, sender: str, sender_bytes: bytes):
+        """Return the cached hasher midstate for a sender, creating it on first use."""
+        hasher = self._sender_cache.get(sender)
+        if hasher is None:
+            if len(self._sender_cache) >= SENDER_CACHE_SIZE:
+                # Evict the oldest entry; dicts preserve insertion order
+                del self._sender_cache[next(iter(self._sender_cache))]
+            hasher = self._sender_cache[sender] = self._tx_id_hasher(sender_bytes)
+        return hasher
+
     def process_transactions(self):
-        # Process each pending transaction
-        for transaction in self.pending_transactions:
+        # Drain and process each pending transaction
+        while True:
+            with self._pending_lock:
+                if not self.pending_transactions:
+                    break
+                transaction = self.pending_transactions.popleft()
             tx_id = transaction["tx_id"]
             tx_type = transaction["tx_type"]
-            vector_id = transaction.get("vector_id")
-
-            # Check if the vector is locked
-            if vector_id in self.locked_vectors:
-                logger.warning(f"Transaction {tx_id} cannot be processed: Vector {vector_id} is currently locked.")
-                continue
-
-            # Lock the vector to prevent concurrent modification
-            self.locked_vectors.add(vector_id)
-
-            try:
-                if tx_type == "VECTOR_CREATE" and transaction["vector_data"]:
-                    # Create a new vector
-                    self.vector_manager.create_vector(vector_id=tx_id, coordinates=transaction["vector_data"])
-                    self.transaction_matrix.add_transaction("Time", "Create", vector_id=tx_id, data=transaction)
-
-                elif tx_type == "VECTOR_UPDATE" and transaction["vector_data"]:
-                    # Update an existing vector
-                    new_state = {"state": "UPDATED"}
-                    self.vector_manager.update_vector(vector_id=tx_id, new_coordinates=transaction["vector_data"], new_state=new_state)
-
-                # Mark transaction as processed
-                self.processed_transactions.add(tx_id)
-
-            except Exception as e:
-                logger.error(f"Error processing transaction {tx_id}: {e}")
-            finally:
-                # Unlock the vector
-                self.locked_vectors.remove(vector_id)
-
-        # Clear pending transactions
-        self.pending_transactions.clear()
+
+            # Transactions address the vector named by vector_id, or the one keyed by their own ID
+            vector_id = transaction.get("vector_id") or tx_id
+
+            # Hold the vector's lock to prevent concurrent modification
+            with self._vector_locks[hash(vector_id) % VECTOR_LOCK_STRIPES]:
+                try:
+                    if tx_type == "VECTOR_CREATE" and transaction["vector_data"]:
+                        # Create a new vector
+                        self.vector_manager.create_vector(vector_id=tx_id, coordinates=transaction["vector_data"])
+                        self.transaction_matrix.add_transaction("Time", "Create", vector_id=tx_id, data=transaction)
+
+                    elif tx_type == "VECTOR_UPDATE" and transaction["vector_data"]:
+                        # Update an existing vector
+                        new_state = {"state": "UPDATED"}
+                        self.vector_manager.update_vector(vector_id=tx_id, new_coordinates=transaction["vector_data"], new_state=new_state)
+
+                    # Mark transaction as processed
+                    self.processed_transactions.add(transaction["tx_hash"])
+
+                except Exception as e:
+                    logger.error(f"Error processing transaction {tx_id}: {e}")
@@ -1,7 +1,17 @@
 from .interfaces.vector_interface import VectorInterface
 from .transaction_layer import TransactionLayer
+import io
+import logging
+import sys
+
+import msgpack
 import numpy as np
-import pickle
+
+# One-byte type tags prefixed to serialized layer data
+LAYER_TAG_NDARRAY = b'\x01'
+LAYER_TAG_DICT = b'\x02'
+
+logger = logging.getLogger(__name__)
 
 class TransactionVector(VectorInterface):
     def __init__(self):
@@ -10,31 +20,44 @@ class TransactionVector(VectorInterface):
 
     def add_layer(self, layer_name: str, data):
         """Add a new layer to the vector with data serialization based on type."""
-        # Handle numpy array data (e.g., coordinate data)
+        # Interned names are shared across vectors and compare by identity on lookup
+        layer_name = sys.intern(layer_name)
+        # Handle numpy array data (e.g., coordinate data), keeping dtype and shape
         if isinstance(data, np.ndarray):
-            byte_data = data.tobytes()
-        # Handle dictionary data (e.g., state information) using pickle
+            buffer = io.BytesIO()
+            buffer.write(LAYER_TAG_NDARRAY)
+            np.lib.format.write_array(buffer, data, allow_pickle=False)
+            byte_data = buffer.getvalue()
+        # Handle dictionary data (e.g., state information) using msgpack
         elif isinstance(data, dict):
-            byte_data = pickle.dumps(data)
+            byte_data = LAYER_TAG_DICT + msgpack.packb(data, use_bin_type=True)
         else:
             raise ValueError(f"Unsupported data type for layer: {type(data)}")
 
         self.layers[layer_name] = TransactionLayer(byte_data)
-        print(f"Layer '{layer_name}' added with serialized data.")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Layer '%s' added with serialized data.", layer_name)
 
     def get_layer(self, layer_name: str):
-        """Retrieve and deserialize a specific layer by name."""
-        layer = self.layers.get(layer_name)
+        """Retrieve and deserialize a specific layer by name. Decoded values are cached per layer."""
+        layer = self.layers.get(sys.intern(layer_name))
         if layer is None:
             return None
 
-        # Deserialize based on stored type
-        byte_data = layer.get_data()
-        try:
-            return np.frombuffer(byte_data)  # Attempt to load as numpy array
-        except ValueError:
-            return pickle.loads(byte_data)   # If not, load as dictionary
+        return layer.get_data_decoded(self._decode_layer)
+
+    @staticmethod
+    def _decode_layer(byte_data: bytes):
+        """Deserialize layer bytes based on the stored type tag."""
+        tag = byte_data[:1]
+        if tag == LAYER_TAG_NDARRAY:
+            buffer = io.BytesIO(byte_data)
+            buffer.seek(1)
+            return np.lib.format.read_array(buffer, allow_pickle=False)
+        if tag == LAYER_TAG_DICT:
+            return msgpack.unpackb(memoryview(byte_data)[1:], raw=False)
+        raise ValueError(f"Unknown data type tag for layer data: {tag!r}")
 
     def get_all_layers(self):
         """Retrieve all layers in the vector."""
-        return {name: self.get_layer(name) for name in self.layers}
+        return {name: layer.get_data_decoded(self._decode_layer) for name, layer in self.layers.items()}
@@ -1,11 +1,188 @@
+import atexit
+import multiprocessing
+import os
 import secrets
+import threading
 from cryptography.hazmat.primitives.asymmetric import ed25519
 
 from oqs import Signature, KeyEncapsulation  # Import Falcon from oqs-python
-from sympy import symbols, Poly, GF
-from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 from mpmath import mp
+from numba import njit
+
+# Moduli below this bound are interpolated with the compiled int64 kernel
+INT64_MODULUS_LIMIT = 2 ** 62
+
+# Bytes of a Kyber shared secret used to mask a share, and of the masked share; 16 bytes cover the 127-bit modulus
+SHARE_SECRET_BYTES = 16
+
+# Below this many coordinates, shipping tasks to the worker processes costs more than the parallel speedup
+PARALLEL_MIN_COORDS = 16
+
+# Signs and verifies share ciphertexts; liboqs calls run through ctypes, which releases the GIL.
+# The pool outlives each call so its threads keep their Falcon signers and verifier
+FALCON_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+
+# Per-process Kyber context and per-thread Falcon signers; liboqs objects can be neither
+# pickled into worker processes nor shared between threads
+_worker_kyber: Optional[KeyEncapsulation] = None
+_thread_local = threading.local()
+
+
+@njit(cache=True)
+def _mulmod64(a: int, b: int, p: int) -> int:
+    """Overflow-free (a * b) mod p for 0 <= a, b < p < 2^62, by double-and-add."""
+    result = 0
+    a %= p
+    while b > 0:
+        if b & 1:
+            result = (result + a) % p
+        a = (a + a) % p
+        b >>= 1
+    return result
+
+
+@njit(cache=True)
+def _powmod64(base: int, exponent: int, p: int) -> int:
+    result = 1
+    base %= p
+    while exponent > 0:
+        if exponent & 1:
+            result = _mulmod64(result, base, p)
+        base = _mulmod64(base, base, p)
+        exponent >>= 1
+    return result
+
+
+@njit(cache=True)
+def _lagrange64(x_s: np.ndarray, y_s: np.ndarray, p: int) -> int:
+    """Lagrange interpolation at x=0 over GF(p) for a prime p < 2^62, with y_s already reduced mod p."""
+    k = x_s.shape[0]
+    result = 0
+    for j in range(k):
+        num = 1
+        den = 1
+        for m in range(k):
+            if m != j:
+                num = _mulmod64(num, (p - x_s[m] % p) % p, p)
+                den = _mulmod64(den, (x_s[j] - x_s[m]) % p, p)
+        if den == 0:
+            raise ValueError("Non-invertible base in modular interpolation")
+        # Fermat inverse: den^(p-2) = den^-1 (mod p)
+        weight = _mulmod64(num, _powmod64(den, p - 2, p), p)
+        result = (result + _mulmod64(y_s[j], weight, p)) % p
+    return result
+
+
+@lru_cache(maxsize=None)
+def _encapsulation_pool() -> ProcessPoolExecutor:
+    """Worker processes for share encapsulation, started on first use and reused by every split."""
+    # Spawned rather than forked: FALCON_POOL threads may already hold liboqs/OpenSSL locks
+    pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+    atexit.register(pool.shutdown)
+    return pool
+
+
+def _worker_kyber_context() -> KeyEncapsulation:
+    """Lazily create this process's Kyber context."""
+    global _worker_kyber
+    if _worker_kyber is None:
+        _worker_kyber = KeyEncapsulation('Kyber512')
+    return _worker_kyber
+
+
+def _thread_signer(falcon_secret_key: bytes) -> Signature:
+    """Lazily create this thread's Falcon signer for the given secret key."""
+    signers: Dict[bytes, Signature] = getattr(_thread_local, 'signers', None)
+    if signers is None:
+        signers = _thread_local.signers = {}
+    signer = signers.get(falcon_secret_key)
+    if signer is None:
+        signer = signers[falcon_secret_key] = Signature("Falcon-512", falcon_secret_key)
+    return signer
+
+
+def _sign_share(falcon_secret_key: bytes, payload: bytes) -> bytes:
+    return _thread_signer(falcon_secret_key).sign(payload)
+
+
+def _verify_share_signature(public_key: bytes, payload_signature: Tuple[bytes, bytes]) -> bool:
+    payload, signature = payload_signature
+    verifier = getattr(_thread_local, 'verifier', None)
+    if verifier is None:
+        verifier = _thread_local.verifier = Signature("Falcon-512")
+    return verifier.verify(payload, signature, public_key)
+
+
+def _share_mask(shared_secret: bytes) -> int:
+    """Field element derived from a Kyber shared secret, used to one-time-pad a share."""
+    if len(shared_secret) < SHARE_SECRET_BYTES:
+        raise ValueError("Shared secret too short for share encryption.")
+    return int.from_bytes(shared_secret[:SHARE_SECRET_BYTES], 'little') % VSS.PRIME_MODULUS
+
+
+def _mask_share(share_value: int, shared_secret: bytes) -> bytes:
+    return ((share_value + _share_mask(shared_secret)) % VSS.PRIME_MODULUS).to_bytes(SHARE_SECRET_BYTES, 'little')
+
+
+def _unmask_share(encrypted_share: bytes, shared_secret: bytes) -> int:
+    return (int.from_bytes(encrypted_share, 'little') - _share_mask(shared_secret)) % VSS.PRIME_MODULUS
+
+
+def _encapsulate_coord_shares(args) -> List[Tuple[int, bytes, bytes]]:
+    """Generate the Shamir shares of one scaled coordinate and encrypt each under a Kyber secret for its recipient."""
+    coord_int, threshold, num_shares, recipient_pubkeys = args
+    kyber = _worker_kyber_context()
+
+    # Generate Shamir shares for this coordinate
+    coefficients = [coord_int % VSS.PRIME_MODULUS] + [secrets.randbelow(VSS.PRIME_MODULUS) for _ in range(threshold - 1)]
+
+    encapsulated = []
+    for i in range(1, num_shares + 1):
+        share_value = VSS._eval_polynomial(coefficients, i)
+        ciphertext, shared_secret = kyber.encap_secret(recipient_pubkeys[i - 1])
+        # Only the recipient can decapsulate the mask, so only they can unmask their share
+        encapsulated.append((i, ciphertext, _mask_share(share_value, shared_secret)))
+    return encapsulated
+
+
+@lru_cache(maxsize=128)
+def _lagrange_weights_at_zero(x_s: Tuple[int, ...], p: int) -> Tuple[int, ...]:
+    """
+    Compute the Lagrange basis weights w_j = prod_{m != j} (-x_m) / (x_j - x_m) mod p.
+
+    All denominators are inverted with a single modular inverse (Montgomery's batch
+    inversion trick). Results are cached since the same share indices recur.
+    """
+    k = len(x_s)
+    numerators = []
+    denominators = []
+    for j in range(k):
+        num = 1
+        den = 1
+        for m in range(k):
+            if m != j:
+                num = (num * -x_s[m]) % p
+                den = (den * (x_s[j] - x_s[m])) % p
+        if den == 0:
+            raise ValueError("Non-invertible base in modular interpolation")
+        numerators.append(num)
+        denominators.append(den)
+
+    # Batch inversion: prefix products, one inverse, then walk back
+    prefix = [1] * (k + 1)
+    for j in range(k):
+        prefix[j + 1] = (prefix[j] * denominators[j]) % p
+    inv = pow(prefix[k], -1, p)
+    inverses = [0] * k
+    for j in range(k - 1, -1, -1):
+        inverses[j] = (inv * prefix[j]) % p
+        inv = (inv * denominators[j]) % p
+
+    return tuple((numerators[j] * inverses[j]) % p for j in range(k))
 
 
 class VSS:
@@ -16,55 +193,111 @@ class VSS:
         # Initialize Kyber and Falcon for key exchange and signing
         self.threshold = 3
         self.kyber = KeyEncapsulation('Kyber512')
+        self.kyber_public_key = self.kyber.generate_keypair()  # Default recipient key for share encapsulation
         self.falcon = Signature("Falcon-512")
         self.falcon_public_key = self.falcon.generate_keypair()  # Generate Falcon public key
         self.falcon_private_key = self.falcon.export_secret_key()
 
-    def split_secret(self, coordinates: np.ndarray, threshold: int, num_shares: int) -> List[
+    def split_secret(self, coordinates: np.ndarray, threshold: int, num_shares: int,
+                     recipient_pubkeys: Optional[List[bytes]] = None) -> List[
         List[Tuple[int, bytes, bytes, bytes]]]:
-        all_shares = []
+        # One Kyber public key per share recipient, reused for every coordinate.
+        # Without explicit recipients the shares are encapsulated to this VSS instance's own key.
+        if recipient_pubkeys is None:
+            recipient_pubkeys = [self.kyber_public_key] * num_shares
+        elif len(recipient_pubkeys) != num_shares:
+            raise ValueError("One recipient public key is required per share.")
 
         # Verify dimensionality of coordinates
        # if len(coordinates) != 3:
         #    raise ValueError("Coordinates array must be 3-dimensional.")
 
-        for coord in coordinates:
-            high_precision_coord = mp.mpf(coord)
-            coord_int = int(high_precision_coord * self.SCALE_FACTOR)
+        # Scale all coordinates to integers in one vectorized pass; float64 is exact enough
+        # for SCALE_FACTOR = 1e8, with mpmath kept for magnitudes beyond the 2^53 integer range
+        coords = np.asarray(coordinates, dtype=np.float64)
+        coords_int = np.rint(coords * self.SCALE_FACTOR).astype(np.int64)
+        exact_limit = 2 ** 53 / self.SCALE_FACTOR
 
-            # Generate Shamir shares for this coordinate
-            x = symbols('x')
-            coefficients = [coord_int] + [secrets.randbelow(self.PRIME_MODULUS) for _ in range(threshold - 1)]
-            polynomial = Poly.from_list(coefficients, x, domain=GF(self.PRIME_MODULUS))
+        tasks = []
+        for idx, coord in enumerate(coords):
+            if abs(coord) > exact_limit:
+                coord_int = int(mp.mpf(float(coord)) * self.SCALE_FACTOR)
+            else:
+                coord_int = int(coords_int[idx])
+            tasks.append((coord_int, threshold, num_shares, recipient_pubkeys))
 
-            # Encrypt and sign shares
-            coord_shares = []
-            for i in range(1, num_shares + 1):
-                share_value = polynomial.eval(i) % self.PRIME_MODULUS
-                public_key = self.kyber.generate_keypair()  # Generate a Kyber public key for encryption
-                ciphertext, shared_secret = self.kyber.encap_secret(public_key)
-                signature = self.falcon.sign(ciphertext)
-                coord_shares.append((i, ciphertext, shared_secret, signature))
+        # Phase 1: coordinates are independent, so large vectors are encapsulated across worker processes
+        if len(tasks) >= PARALLEL_MIN_COORDS:
+            encapsulated = list(_encapsulation_pool().map(_encapsulate_coord_shares, tasks))
+        else:
+            encapsulated = [_encapsulate_coord_shares(task) for task in tasks]
 
-            all_shares.append(coord_shares)
+        # Phase 2: sign every ciphertext and encrypted share of every coordinate in one batched pass;
+        # Kyber ciphertexts have a fixed length, so the concatenation is unambiguous
+        payloads = [
+            ciphertext + encrypted_share
+            for coord_shares in encapsulated for _, ciphertext, encrypted_share in coord_shares
+        ]
+        signatures = iter(FALCON_POOL.map(partial(_sign_share, self.falcon_private_key), payloads))
 
-        return all_shares
+        # Phase 3: attach the signatures back onto their shares
+        return [
+            [(i, ciphertext, encrypted_share, next(signatures)) for i, ciphertext, encrypted_share in coord_shares]
+            for coord_shares in encapsulated
+        ]
+
+    @classmethod
+    def _eval_polynomial(cls, coefficients: List[int], x: int) -> int:
+        """
+        Evaluate a polynomial over GF(PRIME_MODULUS) at x using Horner's rule.
+
+        Parameters:
+            coefficients (List[int]): Coefficients in ascending order of degree, each below the modulus.
+            x (int): Small non-negative evaluation point (the share index).
+
+        Returns:
+            int: The polynomial value modulo PRIME_MODULUS.
+        """
+        p = cls.PRIME_MODULUS
+        y = 0
+        for c in reversed(coefficients):
+            y = y * x + c
+            # Mersenne reduction: 2^127 = 1 (mod p), so fold the high bits onto the low bits
+            y = (y & p) + (y >> 127)
+            if y >= p:
+                y -= p
+        return y
 
     def reconstruct_secret(self, all_encrypted_shares, public_key):
         reconstructed_coords = []
         if len(all_encrypted_shares) < self.threshold:
             raise ValueError("Not enough shares provided for reconstruction.")
+
+        # Verify every share signature up front in one batched pass, stopping at the first failure
+        verify_tasks = [
+            (ciphertext + encrypted_share, signature)
+            for coord_shares in all_encrypted_shares
+            for _, ciphertext, encrypted_share, signature in coord_shares
+        ]
+        futures = [FALCON_POOL.submit(_verify_share_signature, public_key, task) for task in verify_tasks]
+        for future in futures:
+            if not future.result():
+                # The pool is shared, so only this call's outstanding checks are cancelled
+                for pending in futures:
+                    pending.cancel()
+                raise ValueError("Signature verification failed for share.")
+
         for coord_shares in all_encrypted_shares:
             shares_for_reconstruction = []
             for i, ciphertext, encrypted_share, signature in coord_shares:
-                if not self.falcon.verify(ciphertext, signature, public_key):
-                    raise ValueError("Signature verification failed for share.")
                 shared_secret = self.kyber.decap_secret(ciphertext)
-                share_int = int.from_bytes(shared_secret, byteorder='big')
-                shares_for_reconstruction.append((i, share_int))
+                shares_for_reconstruction.append((i, _unmask_share(encrypted_share, shared_secret)))
 
             # Perform Lagrange interpolation and scale back
             coord_int = self._reconstruct_from_shares(shares_for_reconstruction)
+            # Negative coordinates were shared as p - |x|, so lift back to the centred range
+            if coord_int > self.PRIME_MODULUS // 2:
+                coord_int -= self.PRIME_MODULUS
             coord = round(float(mp.mpf(coord_int) / self.SCALE_FACTOR), 4)  # Consistent rounding precision
             reconstructed_coords.append(coord)
 
@@ -81,21 +314,15 @@ class VSS:
         Returns:
             int: The reconstructed secret integer.
         """
-
-        def lagrange_interpolate(x: int, x_s: List[int], y_s: List[int], p: int) -> int:
-            """Perform Lagrange interpolation at x=0 over a finite field with a prime modulus."""
-            k = len(x_s)
-            result = 0
-            for j in range(k):
-                term = y_s[j]
-                for m in range(k):
-                    if m != j:
-                        denom = (x_s[j] - x_s[m]) % p
-                        if denom == 0:
-                            raise ValueError("Non-invertible base in modular interpolation")
-                        term = (term * (x - x_s[m]) * pow(denom, -1, p)) % p
-                result = (result + term) % p
-            return result
-
         x_vals, y_vals = zip(*shares)
-        return lagrange_interpolate(0, x_vals, y_vals, modulus)
+        if modulus < INT64_MODULUS_LIMIT:
+            return self._reconstruct_int64(x_vals, y_vals, modulus)
+        weights = _lagrange_weights_at_zero(tuple(x_vals), modulus)
+        return sum(y * w for y, w in zip(y_vals, weights)) % modulus
+
+    @staticmethod
+    def _reconstruct_int64(x_vals, y_vals, modulus: int) -> int:
+        """Reconstruct the secret with the compiled int64 Lagrange kernel for moduli below 2^62."""
+        x_s = np.array(x_vals, dtype=np.int64)
+        y_s = np.array([y % modulus for y in y_vals], dtype=np.int64)
+        return int(_lagrange64(x_s, y_s, modulus))
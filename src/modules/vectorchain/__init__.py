@@ -1,6 +1,9 @@
+import asyncio
+import base64
 from dataclasses import dataclass
 from typing import Optional
 import logging
+import os
 import time
 from src.modules.account_module.account_manager import AccountManager
 from src.modules.address_module.address_manager import AddressManager
@@ -10,6 +13,8 @@ from src.modules.transaction_module.transaction_manager import TransactionManage
 
 logger = logging.getLogger(__name__)
 
+GENESIS_VECTOR_ID = "genesis"
+
 
 @dataclass
 class NodeIdentity:
@@ -25,6 +30,7 @@ class AxiomChain:
         self.transaction_manager = TransactionManager()
         self.hasher = Blake3Hashing()
         self.identity: Optional[NodeIdentity] = None
+        self._running = False
 
     async def initialize_node(self, ip_address: str) -> NodeIdentity:
         # Generate account ID
@@ -48,17 +54,22 @@ class AxiomChain:
 
     async def _generate_account_id(self) -> str:
         """Generate unique account ID for node."""
-        seed = f"node_{time.time()}"
-        return self.hasher.hash(seed.encode(), "node_account")
+        return self.hasher.hash(os.urandom(16), "node_account")
 
     def get_identity(self) -> Optional[NodeIdentity]:
         """Get current node identity."""
         return self.identity
 
+    def is_running(self) -> bool:
+        """Whether start() has been called since the last stop()."""
+        return self._running
+
     async def start(self):
         """Start the chain with basic components and genesis."""
         try:
             logger.info("Starting AxiomChain...")
+            # Set before the managers start, so stop() still cleans up after a partial start
+            self._running = True
 
             # Initialize vector manager and transaction manager
             await self.vector_manager.start()
@@ -77,10 +88,15 @@ class AxiomChain:
     async def _create_genesis(self):
         """Create genesis vector and transaction."""
         try:
+            # Genesis is sent by the node to itself, encrypted with the node account's Kyber keypair
+            account = self.account_manager.get_account(self.identity.account_id)
+            private_key = base64.b64decode(account["private_key"])
+            public_key = base64.b64decode(account["public_key"])
+
             # Create genesis vector in latent layer
             genesis_coordinates = [0.0] * self.vector_manager.dimension
-            genesis_vector = self.vector_manager.create_vector(
-                vector_id="genesis",
+            self.vector_manager.create_vector(
+                vector_id=GENESIS_VECTOR_ID,
                 coordinates=genesis_coordinates
             )
 
@@ -89,15 +105,14 @@ class AxiomChain:
                 "tx_id": "genesis",
                 "tx_type": "GENESIS",
                 "sender": self.identity.account_id,
-                "vector_id": genesis_vector.id,
+                "vector_id": GENESIS_VECTOR_ID,
                 "timestamp": time.time()
             }
 
-            # Move vector to transaction layer
-            self.vector_manager.secure_layer_data(genesis_vector.id)
-
-            # Process genesis transaction
-            await self.transaction_manager.create_transaction(genesis_tx)
+            # Move vector to transaction layer off the event loop, then process the genesis transaction;
+            # the two run one after the other because neither manager is audited for concurrent use
+            await asyncio.to_thread(self.vector_manager.secure_layer_data, GENESIS_VECTOR_ID)
+            await self.transaction_manager.create_transaction(genesis_tx, private_key, public_key)
 
             logger.info("Genesis created successfully")
             return genesis_tx
@@ -107,7 +122,10 @@ class AxiomChain:
             raise
 
     async def stop(self):
-        """Stop chain components."""
+        """Stop chain components; a no-op unless the chain is running."""
+        if not self._running:
+            return
+        self._running = False
         try:
             logger.info("Stopping AxiomChain...")
 
@@ -1,11 +1,30 @@
+import asyncio
+import itertools
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
 import numpy as np
+import orjson
+from cachetools import LRUCache
 
+from src.modules.crypto_module.blake3_hashing import Blake3Hashing
 from src.modules.transaction_module import TransactionManagerInterface
 from src.modules.vectorchain import logger
 
+PROOF_CACHE_SIZE = 4096
+PROCESS_CONCURRENCY = 200
+PROCESSED_CACHE_SIZE = 10_000
+# Ids are far smaller than vectors, so status is remembered for more transactions than vectors are kept
+PROCESSED_ID_CACHE_SIZE = 100_000
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class ProofRef:
+    """Immutable handle to a ZKP proof and the BLAKE3 digest of the signature it carries."""
+    digest: str
+    proof: Dict
+
 
 class VectorChainInterface(ABC):
     @abstractmethod
@@ -52,17 +71,40 @@ class ZKPSystemInterface(ABC):
         """Verify ZKP proof."""
         pass
 
+    async def verify_proof_batch(self, items: List[Tuple[bytes, Dict, str]]) -> List[bool]:
+        """Verify several (commitment, proof, identifier) triples, returning results in order."""
+        results = await asyncio.gather(*(self.verify_proof(*item) for item in items), return_exceptions=True)
+        return [not isinstance(result, BaseException) and bool(result) for result in results]
+
 
 class VectorChainProcessor(VectorChainInterface):
     def __init__(self,
                  vector_manager: VectorManagerInterface,
                  transaction_manager: TransactionManagerInterface,
-                 zkp_system: ZKPSystemInterface):
+                 zkp_system: ZKPSystemInterface,
+                 proof_cache_size: int = PROOF_CACHE_SIZE,
+                 concurrency: int = PROCESS_CONCURRENCY,
+                 processed_cache_size: int = PROCESSED_CACHE_SIZE,
+                 processed_id_cache_size: int = PROCESSED_ID_CACHE_SIZE):
         self.vector_manager = vector_manager
         self.transaction_manager = transaction_manager
         self.zkp = zkp_system
-        self.pending_transactions: List[Dict] = []
-        self.processed_vectors: Dict[str, np.ndarray] = {}
+        self.hasher = Blake3Hashing()
+        # Pending transactions keyed by tx_id, in submission order
+        self.pending_transactions: Dict[str, Dict] = {}
+        # Only the most recently processed vectors are kept in memory; a larger bounded set of ids
+        # answers status queries
+        self.processed_vectors: LRUCache = LRUCache(maxsize=processed_cache_size)
+        self._processed_ids: LRUCache = LRUCache(maxsize=processed_id_cache_size)
+        # Accepted proofs only; rejections are never cached so transient failures can be retried
+        self._proof_cache: LRUCache = LRUCache(maxsize=proof_cache_size)
+        self._proof_inflight: Dict[str, asyncio.Future] = {}
+        # Pending transactions keep their proof's ProofRef by vector_id, so its digest is computed once
+        self._proof_refs: Dict[str, ProofRef] = {}
+        # Background proof checks started at submission, keyed by vector_id
+        self._preverify_tasks: Dict[str, asyncio.Task] = {}
+        # Bounds how many verified transactions are processed at once
+        self._sem = asyncio.Semaphore(concurrency)
 
     async def submit_transaction(self, transaction: Dict) -> str:
         if not self._validate_transaction_structure(transaction):
@@ -71,87 +113,218 @@ class VectorChainProcessor(VectorChainInterface):
         vector_id = f"tx_{transaction['tx_id']}"
         coordinates = self._extract_transaction_coordinates(transaction)
 
-        await self.vector_manager.create_vector(vector_id, coordinates)
-        commitment, proof = await self.zkp.prove_vector_knowledge(coordinates, vector_id)
+        # The proof only needs the coordinates, so it does not wait on vector storage
+        _, (commitment, proof) = await asyncio.gather(
+            self.vector_manager.create_vector(vector_id, coordinates),
+            self.zkp.prove_vector_knowledge(coordinates, vector_id)
+        )
+        proof_ref = self._proof_ref(proof)
 
         enriched_transaction = {
             **transaction,
             'vector_id': vector_id,
             'proof': proof,
             'commitment': commitment,
-            'timestamp': datetime.now().timestamp()
+            'timestamp': time.time()
         }
 
-        self.pending_transactions.append(enriched_transaction)
+        self.pending_transactions[transaction['tx_id']] = enriched_transaction
+        self._proof_refs[vector_id] = proof_ref
+        self._preverify_tasks[vector_id] = asyncio.create_task(self._preverify(enriched_transaction))
         return vector_id
 
     async def process_transactions(self) -> None:
         if not self.pending_transactions:
             return
 
-        batch = self.pending_transactions[:100]
-        valid_transactions = []
-
-        for tx in batch:
-            if await self._validate_and_process_transaction(tx):
-                valid_transactions.append(tx)
-
-        for tx in valid_transactions:
-            self.processed_vectors[tx['vector_id']] = await self.vector_manager.get_vector(tx['vector_id'])
-
-        self.pending_transactions = [tx for tx in self.pending_transactions if tx not in valid_transactions]
+        batch = list(itertools.islice(self.pending_transactions.values(), 100))
+
+        verified = await self._verify_batch(batch)
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                (tx, tg.create_task(self._process_with_limit(tx)))
+                for tx, is_valid in zip(batch, verified) if is_valid
+            ]
+
+        # Processing already fetched each vector, so the result is stored without a second lookup
+        for tx, task in tasks:
+            vector = task.result()
+            if vector is None:
+                continue
+            self.processed_vectors[tx['vector_id']] = vector
+            self._processed_ids[tx['vector_id']] = True
+            self.pending_transactions.pop(tx['tx_id'], None)
+            self._proof_refs.pop(tx['vector_id'], None)
 
     async def get_transaction_status(self, tx_id: str) -> Dict:
         vector_id = f"tx_{tx_id}"
-        if vector_id in self.processed_vectors:
+        if vector_id in self._processed_ids:
             return {"status": "processed", "vector_id": vector_id}
 
-        for tx in self.pending_transactions:
-            if tx['tx_id'] == tx_id:
-                return {"status": "pending", "vector_id": vector_id}
+        if tx_id in self.pending_transactions:
+            return {"status": "pending", "vector_id": vector_id}
 
         return {"status": "not_found", "vector_id": vector_id}
 
-    async def _validate_and_process_transaction(self, transaction: Dict) -> bool:
+    async def _verify_batch(self, batch: List[Dict]) -> List[bool]:
+        """Verify the proofs of a batch of transactions with one batched ZKP call.
+
+        Transactions whose proof was preverified or is already cached skip the verifier.
+        """
+        results: List[bool] = [False] * len(batch)
+        preverified = {}
+        unverified = []
+
+        for i, tx in enumerate(batch):
+            preverify_task = self._preverify_tasks.pop(tx['vector_id'], None)
+            if preverify_task is not None:
+                preverified[i] = preverify_task
+                continue
+            proof_ref = self._proof_refs.get(tx['vector_id']) or self._proof_ref(tx['proof'])
+            key = self._proof_key(tx['vector_id'], proof_ref, tx['commitment'])
+            if key in self._proof_cache:
+                results[i] = True
+            else:
+                unverified.append((i, key))
+
+        if unverified:
+            try:
+                verdicts = await self.zkp.verify_proof_batch([
+                    (batch[i]['commitment'], batch[i]['proof'], batch[i]['vector_id'])
+                    for i, _ in unverified
+                ])
+            except Exception as e:
+                logger.error(f"Batch proof verification error: {e}")
+                verdicts = [False] * len(unverified)
+            for (i, key), is_valid in zip(unverified, verdicts):
+                results[i] = bool(is_valid)
+                if is_valid:
+                    self._proof_cache[key] = True
+
+        if preverified:
+            outcomes = await asyncio.gather(*preverified.values())
+            for i, is_valid in zip(preverified, outcomes):
+                results[i] = is_valid
+
+        return results
+
+    async def _process_with_limit(self, transaction: Dict) -> Optional[np.ndarray]:
+        async with self._sem:
+            return await self._process_verified_transaction(transaction)
+
+    async def _process_verified_transaction(self, transaction: Dict) -> Optional[np.ndarray]:
+        """Process a transaction whose proof is verified, returning its vector on success."""
         try:
             vector_id = transaction['vector_id']
 
-            if not await self.zkp.verify_proof(
-                    transaction['commitment'],
-                    transaction['proof'],
-                    vector_id
-            ):
-                return False
-
             vector = await self.vector_manager.get_vector(vector_id)
-            if not vector:
-                return False
+            if vector is None:
+                return None
 
             result = await self.transaction_manager.process_transaction(transaction)
-            return bool(result)
+            return vector if result else None
 
         except Exception as e:
             logger.error(f"Transaction processing error: {e}")
+            return None
+
+    async def _preverify(self, transaction: Dict) -> bool:
+        """Verify a pending transaction's proof ahead of processing."""
+        try:
+            return await self.verify_proof_cached(
+                transaction['commitment'],
+                self._proof_refs.get(transaction['vector_id']) or transaction['proof'],
+                transaction['vector_id']
+            )
+        except Exception as e:
+            logger.error(f"Proof preverification error for {transaction['vector_id']}: {e}")
             return False
 
-    def _extract_transaction_coordinates(self, transaction: Dict) -> np.ndarray:
-        coordinates = []
+    async def verify_proof_cached(self, commitment: bytes, proof: Union[Dict, ProofRef], vector_id: str) -> bool:
+        """Verify a ZKP proof, reusing earlier accepts and collapsing concurrent duplicate checks."""
+        proof_ref = proof if isinstance(proof, ProofRef) else self._proof_ref(proof)
+        key = self._proof_key(vector_id, proof_ref, commitment)
+        if key in self._proof_cache:
+            return True
 
-        numerical_fields = ['amount', 'timestamp', 'fee']
-        for field in numerical_fields:
-            if field in transaction:
-                coordinates.append(float(transaction[field]))
+        inflight = self._proof_inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
 
-        if 'metadata' in transaction and isinstance(transaction['metadata'], dict):
-            coordinates.extend([
-                float(value) for value in transaction['metadata'].values()
-                if isinstance(value, (int, float))
-            ])
+        future = asyncio.get_running_loop().create_future()
+        self._proof_inflight[key] = future
+        try:
+            is_valid = bool(await self.zkp.verify_proof(commitment, proof_ref.proof, vector_id))
+            if is_valid:
+                self._proof_cache[key] = True
+            future.set_result(is_valid)
+            return is_valid
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            del self._proof_inflight[key]
+
+    def _proof_ref(self, proof: Dict) -> ProofRef:
+        """Wrap a proof with a digest of its signature.
+
+        The signature already covers every proof field and the commitment, so hashing its few hundred
+        bytes identifies the proof without serializing it; only unsigned proofs fall back to the full form.
+        """
+        signature = proof.get('signature')
+        if isinstance(signature, str):
+            digest = self.hasher.hash(signature.encode(), "proof")
+        else:
+            canonical_proof = orjson.dumps(proof, option=orjson.OPT_SORT_KEYS, default=self._proof_default)
+            digest = self.hasher.hash(canonical_proof, "proof")
+        return ProofRef(digest, proof)
+
+    def _proof_key(self, vector_id: str, proof_ref: ProofRef, commitment: bytes) -> str:
+        """Cache key binding a proof to its vector and commitment."""
+        return self.hasher.hash(proof_ref.digest.encode() + vector_id.encode() + commitment, "pv")
+
+    @staticmethod
+    def _proof_default(obj: Any) -> Any:
+        """orjson encoder for the NumPy and complex values found in ZKP proofs."""
+        if isinstance(obj, complex):
+            return {'real': obj.real, 'imag': obj.imag}
+        elif isinstance(obj, (np.integer, np.floating)):
+            return obj.item()
+        elif isinstance(obj, np.ndarray):
+            if obj.dtype.names:
+                # Record arrays such as proof measurements keep their field names
+                return [dict(zip(obj.dtype.names, row)) for row in obj.tolist()]
+            return obj.tolist()
+        elif isinstance(obj, bytes):
+            return obj.hex()
+        raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
 
-        while len(coordinates) < self.vector_manager.dimensions:
-            coordinates.append(0.0)
+    def _extract_transaction_coordinates(self, transaction: Dict) -> np.ndarray:
+        dims = self.vector_manager.dimensions
+        coordinates = np.zeros(dims, dtype=np.float64)
+        i = 0
 
-        return np.array(coordinates)
+        for field in ('amount', 'timestamp', 'fee'):
+            if i == dims:
+                return coordinates
+            if field in transaction:
+                coordinates[i] = float(transaction[field])
+                i += 1
+
+        metadata = transaction.get('metadata')
+        if isinstance(metadata, dict):
+            for value in metadata.values():
+                if i == dims:
+                    break
+                if isinstance(value, (int, float)):
+                    coordinates[i] = float(value)
+                    i += 1
+
+        return coordinates
 
     def _validate_transaction_structure(self, transaction: Dict) -> bool:
         required_fields = {'tx_id', 'sender', 'receiver', 'amount'}
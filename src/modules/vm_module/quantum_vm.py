@@ -6,25 +6,41 @@ import asyncio
 
 logger = logging.getLogger(__name__)
 
+STATE_DTYPE = "complex128"
+
 
 class QuantumVM:
     def __init__(self):
         """Initialize QuantumVM."""
         self.loaded_contracts = {}
+        self._opcode_handlers = {
+            "PREPARE_STATE": self._prepare_quantum_state,
+            "MEASURE_STATE": self._measure_quantum_state,
+            "ENTANGLE": self._entangle_states,
+        }
         logger.info("QuantumVM initialized")
 
     async def execute_opcode(self, opcode: str, *args, **kwargs) -> Dict[str, Any]:
         """Execute a quantum opcode."""
         logger.info(f"Executing opcode: {opcode} with args: {args}, kwargs: {kwargs}")
 
-        if opcode == "PREPARE_STATE":
-            return await self._prepare_quantum_state(*args, **kwargs)
-        elif opcode == "MEASURE_STATE":
-            return await self._measure_quantum_state(*args, **kwargs)
-        elif opcode == "ENTANGLE":
-            return await self._entangle_states(*args, **kwargs)
-        else:
+        handler = self._opcode_handlers.get(opcode)
+        if handler is None:
             raise ValueError(f"Unknown opcode: {opcode}")
+        return await handler(*args, **kwargs)
+
+    @staticmethod
+    def _encode_state_vector(state_vector: np.ndarray) -> Dict[str, Any]:
+        """Pack a state vector as raw bytes plus its dtype instead of a Python list."""
+        return {"state_vector": state_vector.tobytes(), "dtype": STATE_DTYPE}
+
+    @staticmethod
+    def _decode_state_vector(state: Dict[str, Any]) -> np.ndarray:
+        """Return a state's vector, viewing raw bytes without a copy; lists are still accepted."""
+        state_vector = state.get("state_vector", b"")
+        if isinstance(state_vector, (bytes, bytearray, memoryview)):
+            return np.frombuffer(state_vector, dtype=state.get("dtype", STATE_DTYPE))
+        return np.asarray(state_vector)
 
     async def run_contract(self, contract_code: str) -> Dict[str, Any]:
         """Run quantum contract code."""
@@ -51,7 +67,7 @@ class QuantumVM:
             state_vector[0] = 1  # Initialize to |0⟩ state
 
             return {
-                "state_vector": state_vector.tolist(),
+                **self._encode_state_vector(state_vector),
                 "qubits": qubits,
                 "encoding": encoding,
                 "timestamp": asyncio.get_event_loop().time()
@@ -63,7 +79,7 @@ class QuantumVM:
     async def verify_state(self, state: Dict[str, Any]) -> bool:
         """Verify the validity of a quantum state."""
         try:
-            state_vector = np.array(state.get("state_vector", []))
+            state_vector = self._decode_state_vector(state)
 
             # Basic verification checks
             # 1. Normalization
@@ -90,7 +106,7 @@ class QuantumVM:
     async def _measure_quantum_state(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Measure a quantum state."""
         try:
-            state_vector = np.array(state.get("state_vector", []))
+            state_vector = self._decode_state_vector(state)
             probabilities = np.abs(state_vector) ** 2
 
             # Simulate measurement outcome
@@ -109,14 +125,14 @@ class QuantumVM:
         """Entangle two quantum states."""
         try:
             # Simplified entanglement operation
-            sv1 = np.array(state1.get("state_vector", []))
-            sv2 = np.array(state2.get("state_vector", []))
+            sv1 = self._decode_state_vector(state1)
+            sv2 = self._decode_state_vector(state2)
 
             # Tensor product for entanglement
             entangled_state = np.kron(sv1, sv2)
 
             return {
-                "state_vector": entangled_state.tolist(),
+                **self._encode_state_vector(entangled_state),
                 "qubits": state1.get("qubits", 0) + state2.get("qubits", 0),
                 "encoding": "entangled",
                 "timestamp": asyncio.get_event_loop().time()
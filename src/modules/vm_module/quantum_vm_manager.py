@@ -3,7 +3,8 @@ import logging
 from typing import Optional, Dict, Any
 import asyncio
 import json
-from uuid import uuid4
+import secrets
+import time
 
 from .vm_interface import VMInterface
 from .quantum_vm import QuantumVM
@@ -42,7 +43,8 @@ class QuantumVMManager(VMInterface):
     def load_contract(self, contract_code: str) -> str:
         """Load contract code into the VM."""
         try:
-            contract_id = str(uuid4())
+            # Time-sortable 128-bit id: nanosecond clock followed by 64 random bits
+            contract_id = f"{time.time_ns():016x}{secrets.randbits(64):016x}"
             self.loaded_contracts[contract_id] = {
                 'code': contract_code,
                 'state': 'loaded',
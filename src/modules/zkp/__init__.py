@@ -1,5 +1,5 @@
 # modules/zkp/__init__.py
-from qzkp import QuantumZKP
+from .qzkp_optimized import QuantumZKP
 
 
 __all__ = ['QuantumZKP']
\ No newline at end of file
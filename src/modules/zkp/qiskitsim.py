@@ -1,15 +1,14 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
-from qiskit.quantum_info import Statevector, DensityMatrix
-from qiskit.circuit import QuantumRegister, ClassicalRegister
 from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING
 import numpy as np
 import json
+import orjson
 import logging
 from joblib import Parallel, delayed
 
-# Configure logging to file
-logging.basicConfig(filename="simulation_log.json", level=logging.INFO, format="%(message)s")
+if TYPE_CHECKING:
+    from qiskit.quantum_info import DensityMatrix
 
 
 # Custom function to convert numpy types to native Python types for JSON serialization
@@ -27,18 +26,31 @@ def convert_numpy(obj):
 
 # Validation calculation function without Numba
 def calculate_validation_metrics(dm_data):
+    nonzero = dm_data != 0
+    nnz = np.count_nonzero(nonzero)
+    # Basis states that appear in any nonzero entry; GHZ layers touch only |00..0> and |11..1>
+    support = np.flatnonzero(nonzero.any(axis=0) | nonzero.any(axis=1))
+
     trace_check = np.isclose(np.trace(dm_data), 1.0)
-    eigenvalues = np.linalg.eigvalsh(dm_data)
+    if len(support) <= dm_data.shape[0] // 4:
+        # Every other row and column is zero, so the spectrum is the support block's plus zeros,
+        # and trace(rho @ rho) of a Hermitian matrix is the sum of squared entry magnitudes
+        eigenvalues = np.linalg.eigvalsh(dm_data[np.ix_(support, support)])
+        purity = float(np.sum(np.abs(dm_data[nonzero]) ** 2))
+    else:
+        eigenvalues = np.linalg.eigvalsh(dm_data)
+        purity = np.real(np.trace(dm_data @ dm_data))
     eigenvalue_range = np.all((eigenvalues >= 0) & (eigenvalues <= 1))
-    purity = np.real(np.trace(dm_data @ dm_data))
-    entropy = -np.sum(eigenvalues * np.log2(eigenvalues + 1e-10))  # Stability with epsilon
-    sparsity_ratio = 1.0 - np.count_nonzero(dm_data) / dm_data.size
+    entropy = -np.sum(eigenvalues * np.log2(eigenvalues + 1e-10))  # Stability with epsilon; zero eigenvalues add nothing
+    sparsity_ratio = 1.0 - nnz / dm_data.size
     return trace_check, eigenvalue_range, purity, entropy, sparsity_ratio
 
 
 # Automated validation function (parallelized with joblib)
-def validate_layer(dm, layer):
-    trace_check, eigenvalue_range, purity, entropy, sparsity_ratio = calculate_validation_metrics(dm.data)
+def validate_layer(dm, layer, metrics=None):
+    if metrics is None:
+        metrics = calculate_validation_metrics(dm.data)
+    trace_check, eigenvalue_range, purity, entropy, sparsity_ratio = metrics
     result = {
         "layer": layer + 1,
         "num_qubits": int(np.log2(dm.data.shape[0])),
@@ -52,73 +64,93 @@ def validate_layer(dm, layer):
 
 
 def automated_validation_parallel(density_matrices):
-    # Use joblib to parallelize validation across density matrix layers
-    validation_results = Parallel(n_jobs=-1)(delayed(validate_layer)(dm, i) for i, dm in enumerate(density_matrices))
-    # Log results to file
-    with open("quantum_validation_logs.json", "a") as f:
-        for result in validation_results:
-            log_entry = {
-                "timestamp": datetime.now().isoformat(),
-                **result
-            }
-            json.dump(log_entry, f, default=convert_numpy)
-            f.write("\n")
+    # Layers of the same width share one cached density matrix, so each distinct matrix is validated once
+    distinct = list({id(dm): dm for dm in density_matrices}.values())
+    metrics = Parallel(n_jobs=-1)(delayed(calculate_validation_metrics)(dm.data) for dm in distinct)
+    metrics_by_id = {id(dm): m for dm, m in zip(distinct, metrics)}
+    validation_results = [validate_layer(dm, i, metrics_by_id[id(dm)]) for i, dm in enumerate(density_matrices)]
+    # Log results to file as JSON lines, serialised up front and appended in a single write
+    timestamp = datetime.now().isoformat()
+    lines = b"".join(
+        orjson.dumps({"timestamp": timestamp, **result}, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE,
+                     default=convert_numpy)
+        for result in validation_results
+    )
+    with open("quantum_validation_logs.json", "ab") as f:
+        f.write(lines)
     return validation_results
 
 
-# Quantum Circuit Setup
-num_transactions = 4
-num_vector_layers = 4
-
-# Initialize Registers and Quantum Circuit
-transaction_regs = [QuantumRegister(num_transactions, f'tx_{i}') for i in range(num_vector_layers)]
-classical_regs = [ClassicalRegister(num_transactions, f'cr_{i}') for i in range(num_vector_layers)]
-measured_qc = QuantumCircuit(*transaction_regs, *classical_regs)
-
-# Apply Hadamard and CNOT gates for entanglement
-for i in range(num_vector_layers):
-    measured_qc.h(transaction_regs[i][0])
-    for j in range(1, num_transactions):
-        measured_qc.cx(transaction_regs[i][0], transaction_regs[i][j])
-
-# Entangle layers
-for i in range(num_vector_layers - 1):
-    measured_qc.cx(transaction_regs[i][-1], transaction_regs[i + 1][0])
-
-# Add Measurements
-for i in range(num_vector_layers):
-    measured_qc.measure(transaction_regs[i], classical_regs[i])
-
-# Compile and Run the Circuit
-simulator = AerSimulator()
-compiled_circuit = transpile(measured_qc, simulator)
-result = simulator.run(compiled_circuit, shots=1024).result()
-
-# Retrieve Measurement Counts with Error Handling
-try:
-    counts = result.get_counts()
-    print("Measurement Counts:", counts)
-except Exception as e:
-    print(f"Error retrieving counts: {e}")
-    counts = {}
-
-# Process each layer individually to avoid large density matrix issues
-density_matrices = []
-for i in range(num_vector_layers):
-    single_layer_qc = QuantumCircuit(transaction_regs[i])
-    single_layer_qc.h(transaction_regs[i][0])
-    for j in range(1, num_transactions):
-        single_layer_qc.cx(transaction_regs[i][0], transaction_regs[i][j])
-
-    # Create the density matrix for this layer
-    state = Statevector(single_layer_qc)
-    density_matrices.append(DensityMatrix(state))
-
-# Run automated validation on individual layer density matrices using joblib for parallel processing
-validation_results = automated_validation_parallel(density_matrices)
-
-# Save validation results to a JSON file
-with open("validation_results.json", "w") as file:
-    json.dump(validation_results, file, indent=4, default=convert_numpy)
-
-print("Validation complete. Results saved to 'validation_results.json'.")
+@lru_cache(maxsize=None)
+def _layer_density(num_tx: int) -> "DensityMatrix":
+    # Every layer is the same H + CNOT cascade, so its density matrix depends only on the width
+    from qiskit import QuantumCircuit
+    from qiskit.quantum_info import Statevector, DensityMatrix
+
+    layer_qc = QuantumCircuit(num_tx)
+    layer_qc.h(0)
+    for j in range(1, num_tx):
+        layer_qc.cx(0, j)
+    return DensityMatrix(Statevector(layer_qc))
+
+
+def _main():
+    # qiskit is only needed for an explicit simulation run, so importing this module stays cheap
+    from qiskit import QuantumCircuit, transpile
+    from qiskit_aer import AerSimulator
+    from qiskit.circuit import QuantumRegister, ClassicalRegister
+
+    # Configure logging to file
+    logging.basicConfig(filename="simulation_log.json", level=logging.INFO, format="%(message)s")
+
+    # Quantum Circuit Setup
+    num_transactions = 4
+    num_vector_layers = 4
+
+    # Initialize Registers and Quantum Circuit
+    transaction_regs = [QuantumRegister(num_transactions, f'tx_{i}') for i in range(num_vector_layers)]
+    classical_regs = [ClassicalRegister(num_transactions, f'cr_{i}') for i in range(num_vector_layers)]
+    measured_qc = QuantumCircuit(*transaction_regs, *classical_regs)
+
+    # Apply Hadamard and CNOT gates for entanglement
+    for i in range(num_vector_layers):
+        measured_qc.h(transaction_regs[i][0])
+        for j in range(1, num_transactions):
+            measured_qc.cx(transaction_regs[i][0], transaction_regs[i][j])
+
+    # Entangle layers
+    for i in range(num_vector_layers - 1):
+        measured_qc.cx(transaction_regs[i][-1], transaction_regs[i + 1][0])
+
+    # Add Measurements
+    for i in range(num_vector_layers):
+        measured_qc.measure(transaction_regs[i], classical_regs[i])
+
+    # Compile and Run the Circuit
+    simulator = AerSimulator()
+    compiled_circuit = transpile(measured_qc, simulator)
+    result = simulator.run(compiled_circuit, shots=1024).result()
+
+    # Retrieve Measurement Counts with Error Handling
+    try:
+        counts = result.get_counts()
+        print("Measurement Counts:", counts)
+    except Exception as e:
+        print(f"Error retrieving counts: {e}")
+        counts = {}
+
+    # Process each layer individually to avoid large density matrix issues
+    density_matrices = [_layer_density(num_transactions) for _ in range(num_vector_layers)]
+
+    # Run automated validation on individual layer density matrices using joblib for parallel processing
+    validation_results = automated_validation_parallel(density_matrices)
+
+    # Save validation results to a JSON file
+    with open("validation_results.json", "w") as file:
+        json.dump(validation_results, file, indent=4, default=convert_numpy)
+
+    print("Validation complete. Results saved to 'validation_results.json'.")
+
+
+if __name__ == "__main__":
+    _main()
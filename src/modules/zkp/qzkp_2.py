@@ -1,98 +1,142 @@
-import json
+import base64
 import numpy as np
-import hashlib
+import blake3
 import logging
+import math
+import os
+import struct
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, List, Dict
 from oqs import Signature
-from joblib import Parallel, delayed
-from numba import njit
+from numba import njit, prange
+
+if __package__:
+    from .qzkp_core import adjust_to_square_length, calculate_entropy, falcon_signer, square_length, thread_rng
+else:
+    # Run as a standalone script from this directory
+    from qzkp_core import adjust_to_square_length, calculate_entropy, falcon_signer, square_length, thread_rng
 
 logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger(__name__)
 
-@njit
-def adjust_to_square_length(vector: np.ndarray) -> np.ndarray:
-    target_length = int(np.ceil(np.sqrt(len(vector))) ** 2)
-    if len(vector) < target_length:
-        padded_vector = np.zeros(target_length, dtype=vector.dtype)
-        padded_vector[:len(vector)] = vector
-        return padded_vector
-    return vector
-
-@njit
-def calculate_entropy(amplitudes: np.ndarray) -> float:
-    probabilities = np.abs(amplitudes) ** 2
-    entropy = -np.sum(probabilities * np.log2(probabilities + 1e-10))
-    return entropy
-
-def generate_measurements(state_coordinates: np.ndarray, security_level: int) -> List[Tuple[int, float, float]]:
+# Amplitudes come from a normalised vector, so single precision is enough to bind them
+# into the commitment and signature while halving the bytes hashed and signed
+PROOF_DTYPE = np.float32
+
+# Fixed binary layout of one measurement, shared by signing and verification
+MEASUREMENT_DTYPE = np.dtype([('idx', '<i4'), ('prob', '<f4'), ('phase', '<f4')])
+
+# Rows signed per thread-pool task; every task reuses its thread's signer for the whole chunk
+PROOF_CHUNK_SIZE = 1000
+
+# liboqs releases the GIL while signing, so proofs are assembled and signed on threads
+SIGNING_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+
+@njit(parallel=True, fastmath=True, cache=True)
+def compute_proof_fields(V: np.ndarray, out_prob: np.ndarray, out_coh: np.ndarray, out_ent: np.ndarray) -> None:
+    # Normalises each padded row of V in place and fills its probabilities, coherence and entropy
+    n, d = V.shape
+    for i in prange(n):
+        s = 0.0
+        for j in range(d):
+            s += V[i, j] * V[i, j]
+        inv = 1.0 / np.sqrt(s)
+        coherence = 0.0
+        entropy = 0.0
+        for j in range(d):
+            a = V[i, j] * inv
+            V[i, j] = a
+            p = a * a
+            out_prob[i, j] = p
+            coherence += abs(a)
+            entropy -= p * np.log2(p + 1e-10)
+        out_coh[i] = coherence / d
+        out_ent[i] = entropy
+
+def generate_measurements(probabilities: np.ndarray, security_level: int) -> np.ndarray:
+    # Amplitudes are real, so every measured phase is zero
     num_measurements = security_level // 8
-    basis_indices = np.random.randint(0, len(state_coordinates), size=num_measurements)
-    amplitudes = state_coordinates[basis_indices]
-    probabilities = np.abs(amplitudes) ** 2
-    phases = np.angle(amplitudes)
+    basis_indices = thread_rng().integers(0, len(probabilities), size=num_measurements)
 
-    # Return measurements as tuples for efficiency
-    return [(int(idx), float(prob), float(phase)) for idx, prob, phase in zip(basis_indices, probabilities, phases)]
+    measurements = np.zeros(num_measurements, dtype=MEASUREMENT_DTYPE)
+    measurements['idx'] = basis_indices
+    measurements['prob'] = probabilities[basis_indices]
+    return measurements
 
 def generate_commitment(coordinates: np.ndarray, coherence: float, identifier: str) -> bytes:
-    h = hashlib.sha3_256()
-    h.update(coordinates.tobytes())
-    h.update(str(coherence).encode())
-    h.update(identifier.encode())
-    return h.digest()
-
-def prepare_message_for_signing(proof: dict, commitment: bytes) -> bytes:
-    proof_copy = {k: v for k, v in proof.items() if k != "signature"}
-    serialized_message = json.dumps(
-        proof_copy, sort_keys=True, default=complex_encoder, separators=(',', ':')
-    ).encode('utf-8')
-    return serialized_message + commitment
-
-def complex_encoder(obj):
-    if isinstance(obj, complex):
-        return {'real': obj.real, 'imag': obj.imag}
-    elif isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
-
-def prove_vector_knowledge_worker(vector: np.ndarray, identifier: str, dimensions: int, security_level: int) -> Tuple[bytes, Dict]:
-    vector = vector / np.linalg.norm(vector)
+    # The preimage is small, so it is joined once and hashed in a single BLAKE3 call
+    preimage = b''.join((coordinates.tobytes(), str(coherence).encode(), identifier.encode()))
+    return blake3.blake3(preimage).digest()
+
+def prepare_message_for_signing(coordinates: np.ndarray, coherence: float, entropy: float, identifier: str,
+                                dimensions: int, measurements: np.ndarray, commitment: bytes) -> bytes:
+    # Fixed-layout binary message: raw float32 amplitudes, scalar fields, length-prefixed
+    # identifier, then the packed measurement records and the commitment
+    identifier_bytes = identifier.encode()
+    return b''.join((
+        coordinates.astype(PROOF_DTYPE, copy=False).tobytes(),
+        struct.pack('<ffI', coherence, entropy, dimensions),
+        struct.pack('<I', len(identifier_bytes)), identifier_bytes,
+        measurements.tobytes(),
+        commitment
+    ))
+
+def prove_vector_knowledge_worker(vector: np.ndarray, identifier: str, dimensions: int, security_level: int,
+                                  signer: Signature = None) -> Tuple[bytes, Dict]:
+    # Own a float32 copy, then scale it in place by the inverse norm from a single dot product
+    vector = np.array(vector, dtype=PROOF_DTYPE)
+    vector *= 1.0 / math.sqrt(vector.dot(vector))
     vector = adjust_to_square_length(vector)
 
-    phase = np.zeros(len(vector))
-    coordinates = vector * np.exp(1j * phase)
-    coherence = np.mean(np.abs(coordinates))
-    entropy = calculate_entropy(coordinates)
+    # The state has zero phase, so amplitudes are the real vector itself; probabilities are
+    # computed once and shared by the entropy and the measurements
+    probabilities = vector * vector
+    coherence = np.mean(np.abs(vector))
+    entropy = calculate_entropy(vector)
 
-    commitment = generate_commitment(coordinates, coherence, identifier)
-    measurements = generate_measurements(coordinates, security_level)
+    measurements = generate_measurements(probabilities, security_level)
+    return _assemble_proof(vector, coherence, entropy, measurements, identifier, dimensions, signer)
 
+def _assemble_proof(vector: np.ndarray, coherence: float, entropy: float, measurements: np.ndarray,
+                    identifier: str, dimensions: int, signer: Signature = None) -> Tuple[bytes, Dict]:
+    commitment = generate_commitment(vector, coherence, identifier)
     proof = {
         'quantum_dimensions': dimensions,
-        'basis_coefficients': [complex(c) for c in coordinates],
+        # Raw float32 buffer, base64-encoded once; decode with np.frombuffer(..., dtype=np.float32)
+        'basis_coefficients': base64.b64encode(vector.tobytes()).decode('ascii'),
         'measurements': measurements,
         'state_metadata': {
             'coherence': coherence,
             'entanglement': entropy,
-            'identifier': identifier
+            'identifier': identifier,
+            'hash_algo': 'blake3'
         },
         'identifier': identifier
     }
-    message = prepare_message_for_signing(proof, commitment)
+    message = prepare_message_for_signing(vector, coherence, entropy, identifier, dimensions,
+                                          measurements, commitment)
 
-    falcon_signature = Signature("Falcon-512")
-    falcon_signature.generate_keypair()
-    signature = falcon_signature.sign(message)
+    if signer is None:
+        signer = falcon_signer()
+    signature = signer.sign(message)
     proof['signature'] = signature.hex()
 
     return commitment, proof
 
+def _prove_rows(V: np.ndarray, coherence: np.ndarray, entropy: np.ndarray, basis_indices: np.ndarray,
+                measured_probs: np.ndarray, identifiers: List[str], dimensions: int,
+                start: int, stop: int) -> List[Tuple[bytes, Dict]]:
+    signer = falcon_signer()
+    results = []
+    for i in range(start, stop):
+        measurements = np.zeros(basis_indices.shape[1], dtype=MEASUREMENT_DTYPE)
+        measurements['idx'] = basis_indices[i]
+        measurements['prob'] = measured_probs[i]
+        results.append(_assemble_proof(V[i], coherence[i], entropy[i], measurements, identifiers[i],
+                                       dimensions, signer))
+    return results
+
 class QuantumZKP:
     def __init__(self, dimensions: int = 8, security_level: int = 128):
         self.dimensions = dimensions
@@ -100,19 +144,37 @@ class QuantumZKP:
         logger.debug("Initialized QuantumZKP instance")
 
     def prove_vector_knowledge_batch(self, vectors: List[np.ndarray], identifiers: List[str]) -> List[Tuple[bytes, Dict]]:
-        # Warming up the cache for JIT and joblib parallel processing
-        self._warm_up_cache(vectors[:10], identifiers[:10])
-
-        results = Parallel(n_jobs=-1, batch_size=10)(
-            delayed(prove_vector_knowledge_worker)(vector, identifier, self.dimensions, self.security_level)
-            for vector, identifier in zip(vectors, identifiers)
-        )
-        return results
-
-    def _warm_up_cache(self, vectors, identifiers):
-        # Run a warm-up pass to compile and cache the results of JIT functions
-        for vector, identifier in zip(vectors, identifiers):
-            _ = prove_vector_knowledge_worker(vector, identifier, self.dimensions, self.security_level)
+        if not vectors:
+            return []
+
+        length = len(vectors[0])
+        if any(len(vector) != length for vector in vectors):
+            # Rows of a single matrix need a common padded length; mixed sizes go one by one
+            return [
+                prove_vector_knowledge_worker(vector, identifier, self.dimensions, self.security_level)
+                for vector, identifier in zip(vectors, identifiers)
+            ]
+
+        # Stack and pad the whole batch once, then compute the numeric proof fields in one kernel
+        n = len(vectors)
+        target_len = square_length(length)
+        V = np.zeros((n, target_len), dtype=PROOF_DTYPE)
+        V[:, :length] = np.asarray(vectors, dtype=PROOF_DTYPE)
+        probabilities = np.empty_like(V)
+        coherence = np.empty(n, dtype=PROOF_DTYPE)
+        entropy = np.empty(n, dtype=PROOF_DTYPE)
+        compute_proof_fields(V, probabilities, coherence, entropy)
+
+        num_measurements = self.security_level // 8
+        basis_indices = thread_rng().integers(0, target_len, size=(n, num_measurements))
+        measured_probs = np.take_along_axis(probabilities, basis_indices, axis=1)
+
+        futures = [
+            SIGNING_POOL.submit(_prove_rows, V, coherence, entropy, basis_indices, measured_probs,
+                                identifiers, self.dimensions, start, min(start + PROOF_CHUNK_SIZE, n))
+            for start in range(0, n, PROOF_CHUNK_SIZE)
+        ]
+        return [result for future in futures for result in future.result()]
 
 # Performance testing code
 if __name__ == "__main__":
@@ -0,0 +1,192 @@
+import base64
+import hashlib
+import logging
+import math
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import numpy as np
+import orjson
+from numba import njit
+from oqs import Signature
+
+logger = logging.getLogger(__name__)
+
+# Shared proving primitives for qzkp_optimized, revised_gemini and test_qzkp_lmvs, so each
+# kernel is defined, JIT-compiled and cached once per process
+
+ENTROPY_EPSILON = 1e-10
+# Leading byte of every binary signing message, so the layout can evolve
+PROOF_ENCODING_VERSION = 1
+# Proofs from version 2 on carry basis_coefficients as one base64 buffer; version 1 lists them
+PROOF_FORMAT_VERSION = 2
+# Prefixed to the encoded proof before hashing, so the signed digest is bound to this scheme
+SIGNING_DOMAIN = b"axiomverse-qzkp-sign"
+# Measurements are kept as one record array; its bytes are exactly what gets signed
+MEASUREMENT_DTYPE = np.dtype([('basis_index', '<u4'), ('probability', '<f4'), ('phase', '<f4')])
+# legacy_json proofs sign their measurements as JSON floats, so they keep full double precision
+LEGACY_MEASUREMENT_DTYPE = np.dtype([('basis_index', '<u4'), ('probability', '<f8'), ('phase', '<f8')])
+
+# Per-thread state: a PCG64 generator so measurement draws never contend on a shared RNG lock,
+# and a Falcon-512 signer since liboqs contexts are not thread-safe
+_thread_local = threading.local()
+
+
+def thread_rng() -> np.random.Generator:
+    """This thread's generator; the pid check gives forked children a fresh stream instead of replaying the parent's."""
+    rng = getattr(_thread_local, 'rng', None)
+    if rng is None or _thread_local.rng_pid != os.getpid():
+        rng = _thread_local.rng = np.random.default_rng()
+        _thread_local.rng_pid = os.getpid()
+    return rng
+
+
+def falcon_signer() -> Signature:
+    """This thread's Falcon-512 signer, created with a keypair on first use.
+
+    The pid check keeps forked children off the parent's keypair.
+    """
+    signer = getattr(_thread_local, 'signer', None)
+    if signer is None or _thread_local.signer_pid != os.getpid():
+        signer = Signature("Falcon-512")
+        signer.generate_keypair()
+        _thread_local.signer = signer
+        _thread_local.signer_pid = os.getpid()
+    return signer
+
+
+def square_length(n: int) -> int:
+    """Smallest perfect square that is at least n."""
+    # Integer square root avoids the float round-trip of ceil(sqrt(n))
+    return (math.isqrt(n - 1) + 1) ** 2 if n else 0
+
+
+def adjust_to_square_length(vector: np.ndarray) -> np.ndarray:
+    """Zero-pad a vector to the next perfect-square length with a single copy, keeping its dtype."""
+    n = len(vector)
+    target_length = square_length(n)
+    if n < target_length:
+        return np.pad(vector, (0, target_length - n))
+    return vector
+
+
+@njit(fastmath=True, cache=True, boundscheck=False)
+def calculate_entropy(amplitudes: np.ndarray) -> float:
+    """Entropy of the measurement distribution of the given amplitudes."""
+    # One fused pass: |a|^2 stays in registers and feeds the reduction, with no temporaries;
+    # fastmath lets LLVM vectorise the log2 calls
+    entropy = 0.0
+    for k in range(amplitudes.shape[0]):
+        a = amplitudes[k]
+        p = a.real * a.real + a.imag * a.imag
+        entropy -= p * np.log2(p + ENTROPY_EPSILON)
+    return entropy
+
+
+@dataclass(slots=True)
+class QuantumStateVector:
+    """Represents a quantum state vector."""
+    coordinates: np.ndarray
+    # Derived in __post_init__; the defaults let callers build a state from coordinates alone
+    entanglement: float = 0.0
+    coherence: float = 0.0
+    state_type: str = "SUPERPOSITION"
+    timestamp: float = 0.0
+    _serialized: Optional[bytes] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.coordinates = self._normalize(self.coordinates)
+        self.coherence = self.calculate_coherence()
+        self.entanglement = self.calculate_entanglement()
+        self.timestamp = time.time()
+
+    def _normalize(self, vector: np.ndarray) -> np.ndarray:
+        """Normalizes the state vector."""
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            return vector / norm
+        else:
+            logger.warning("Attempted to normalize a zero vector.")
+            return np.zeros_like(vector)
+
+    def calculate_coherence(self) -> float:
+        """Calculates the coherence of the state vector."""
+        return float(np.mean(np.abs(self.coordinates)))
+
+    def calculate_entanglement(self) -> float:
+        """Calculates entanglement (currently simplified)."""
+        # In a real quantum system, entanglement calculation is much more complex.
+        # Here we use a proxy based on entropy.
+        return calculate_entropy(self.coordinates)
+
+    def serialize(self) -> bytes:
+        """Serializes the state vector to JSON, once per state."""
+        if self._serialized is not None:
+            return self._serialized
+        # orjson writes the ndarray and numpy scalars natively and returns bytes directly
+        self._serialized = orjson.dumps({
+            "coordinates": np.ascontiguousarray(self.coordinates),
+            "entanglement": self.entanglement,
+            "coherence": self.coherence,
+            "state_type": self.state_type,
+            "timestamp": self.timestamp
+        }, option=orjson.OPT_SERIALIZE_NUMPY)
+        return self._serialized
+
+
+def encode_coefficients(coefficients: np.ndarray) -> Dict[str, Any]:
+    """Pack basis coefficients as one base64 complex128 buffer rather than a list of complex values."""
+    data = np.ascontiguousarray(coefficients, dtype=np.complex128)
+    return {'dtype': 'complex128', 'shape': list(data.shape), 'b64': base64.b64encode(data.tobytes()).decode('ascii')}
+
+
+def decode_coefficients(encoded: Dict[str, Any]) -> np.ndarray:
+    """Zero-copy view of the coefficients packed by encode_coefficients."""
+    data = np.frombuffer(base64.b64decode(encoded['b64']), dtype=encoded['dtype'])
+    return data.reshape(encoded['shape']) if 'shape' in encoded else data
+
+
+def proof_coefficients(proof: Dict) -> np.ndarray:
+    """Basis coefficients of a proof in either format version."""
+    if proof.get('version', 1) >= 2:
+        return decode_coefficients(proof['basis_coefficients'])
+    # Version 1 lists each coefficient, complex ones as {'real', 'imag'} dicts
+    return np.array([
+        complex(c) if isinstance(c, (int, float, complex))
+        else complex(c['real'], c['imag'])
+        for c in proof['basis_coefficients']
+    ], dtype=np.complex128)
+
+
+def encode_proof_binary(proof: Dict, commitment: bytes) -> bytes:
+    """Encode the signed fields of a proof into a fixed little-endian binary layout."""
+    coefficients = np.ascontiguousarray(proof_coefficients(proof), dtype='<c16')
+    measurements = proof['measurements']
+    if not isinstance(measurements, np.ndarray):
+        # Proofs that went through JSON or msgpack carry their measurements as dicts or as
+        # (basis_index, probability, phase) rows
+        measurements = np.array([
+            (m['basis_index'], m['probability'], m['phase']) if isinstance(m, dict) else tuple(m)
+            for m in measurements
+        ], dtype=MEASUREMENT_DTYPE)
+    metadata = proof['state_metadata']
+    scalars = np.array([metadata[key] for key in sorted(metadata)], dtype='<f8')
+    identifier = proof['identifier'].encode()
+    return b''.join((
+        struct.pack('<BIII', PROOF_ENCODING_VERSION, proof['quantum_dimensions'], len(coefficients),
+                    len(measurements)),
+        coefficients.tobytes(),
+        np.ascontiguousarray(measurements, dtype=MEASUREMENT_DTYPE).tobytes(),
+        scalars.tobytes(),
+        struct.pack('<I', len(identifier)), identifier,
+        commitment
+    ))
+
+
+def binary_signing_message(proof: Dict, commitment: bytes) -> bytes:
+    """Hash-then-sign message: Falcon signs a fixed 32-byte digest whatever the vector size."""
+    return hashlib.sha3_256(SIGNING_DOMAIN + encode_proof_binary(proof, commitment)).digest()
@@ -1,7 +1,10 @@
+import blake3
+import copy
 import json
 import numpy as np
 import hashlib
 import logging
+import math
 import time
 import os
 import psutil
@@ -9,7 +12,7 @@ from typing import Tuple, List, Dict, Optional, Any
 from dataclasses import dataclass, field
 from oqs import Signature
 from joblib import Parallel, delayed
-from numba import njit, prange, cuda
+from numba import njit
 from functools import lru_cache
 import concurrent.futures
 import threading
@@ -17,8 +20,11 @@ from concurrent.futures import ThreadPoolExecutor
 import queue
 import asyncio
 import warnings
-from collections import deque
-from qzkp import QuantumStateVector
+from cachetools import LRUCache
+from .qzkp_core import (
+    ENTROPY_EPSILON, LEGACY_MEASUREMENT_DTYPE, MEASUREMENT_DTYPE, PROOF_FORMAT_VERSION, QuantumStateVector,
+    binary_signing_message, calculate_entropy, encode_coefficients, proof_coefficients
+)
 
 # Configure logging
 logging.basicConfig(level=logging.WARNING)
@@ -26,11 +32,15 @@ logger = logging.getLogger(__name__)
 
 # Constants
 MAX_VECTOR_SIZE = 1024
-ENTROPY_EPSILON = 1e-10
 PROBABILITY_TOLERANCE = 1e-5
 DEFAULT_BATCH_SIZE = 1000
 MAX_CACHE_SIZE = 10000
-THREAD_COUNT = min(32, (os.cpu_count() or 1) * 4)
+PROOF_CACHE_SIZE = 8192
+# Below this many amplitudes the kernel launch and transfers cost more than the CPU path
+GPU_ENTROPY_THRESHOLD = 100_000
+GPU_THREADS_PER_BLOCK = 256
+# Signing, verification and hashing release the GIL, so one thread per core saturates the CPU
+THREAD_COUNT = os.cpu_count() or 1
 
 # Initialize thread pool
 THREAD_POOL = ThreadPoolExecutor(max_workers=THREAD_COUNT)
@@ -46,29 +56,76 @@ def set_cpu_affinity():
 
 
 # GPU Support Check
-USE_GPU = cuda.is_available()
-if USE_GPU:
-    logger.info("CUDA GPU support enabled")
+# numba.cuda probes the driver on import, so it is only loaded when the GPU path is opted into
+GPU_ENV_VAR = "AXIOMVERSE_QZKP_GPU"
+cuda = None
 
 
-@njit(parallel=True, fastmath=True)
-def adjust_to_square_length(vector: np.ndarray) -> np.ndarray:
-    """Optimized vector length adjustment using parallel processing."""
-    target_length = int(np.ceil(np.sqrt(len(vector))) ** 2)
-    if len(vector) < target_length:
-        result = np.zeros(target_length, dtype=vector.dtype)
-        for i in prange(len(vector)):
-            result[i] = vector[i]
-        return result
-    return vector
+@lru_cache(maxsize=None)
+def _gpu_entropy_kernel():
+    """Import numba.cuda and compile the entropy kernel on first use; None if no GPU is usable."""
+    global cuda
+    from numba import cuda as numba_cuda
+    if not numba_cuda.is_available():
+        return None
+    cuda = numba_cuda
 
+    @cuda.jit
+    def gpu_calculate_entropy(amplitudes, out):
+        """GPU-accelerated entropy: each block reduces in shared memory and adds once into out[0]."""
+        partial = cuda.shared.array(GPU_THREADS_PER_BLOCK, dtype=np.float64)
+        tid = cuda.threadIdx.x
+        idx = cuda.grid(1)
+        value = 0.0
+        if idx < amplitudes.size:
+            a = amplitudes[idx]
+            prob = a.real * a.real + a.imag * a.imag
+            if prob > ENTROPY_EPSILON:
+                value = -prob * math.log2(prob)
+        partial[tid] = value
+        cuda.syncthreads()
 
-#@njit(fastmath=True)
-def calculate_entropy(amplitudes: np.ndarray) -> float:
-    """Optimized entropy calculation using Numba."""
-    probabilities = np.abs(amplitudes) ** 2
-    log_probs = np.log2(probabilities + ENTROPY_EPSILON)
-    return -np.sum(probabilities * log_probs)
+        stride = cuda.blockDim.x // 2
+        while stride > 0:
+            if tid < stride:
+                partial[tid] += partial[tid + stride]
+            cuda.syncthreads()
+            stride //= 2
+
+        if tid == 0:
+            cuda.atomic.add(out, 0, partial[0])
+
+    logger.info("CUDA GPU support enabled")
+    return gpu_calculate_entropy
+
+
+# Explicit signature compiles eagerly (or loads from the on-disk cache) at import, not on the first proof
+@njit('Tuple((float64, int64[::1], float64[::1], float64[::1]))(complex128[::1], int64, int64)',
+      fastmath=True, cache=True, boundscheck=False)
+def _proof_kernel(coordinates: np.ndarray, seed: int, num_measurements: int):
+    """Entropy and sampled measurements of a state from a single pass over its amplitudes."""
+    n = coordinates.shape[0]
+    entropy = 0.0
+    for k in range(n):
+        a = coordinates[k]
+        p = a.real * a.real + a.imag * a.imag
+        entropy -= p * np.log2(p + ENTROPY_EPSILON)
+
+    # xorshift64 keeps index sampling inside the kernel; the seed must be nonzero
+    indices = np.empty(num_measurements, dtype=np.int64)
+    probabilities = np.empty(num_measurements, dtype=np.float64)
+    phases = np.empty(num_measurements, dtype=np.float64)
+    state = np.uint64(seed)
+    for i in range(num_measurements):
+        state ^= state << np.uint64(13)
+        state ^= state >> np.uint64(7)
+        state ^= state << np.uint64(17)
+        k = np.int64(state % np.uint64(n))
+        a = coordinates[k]
+        indices[i] = k
+        probabilities[i] = a.real * a.real + a.imag * a.imag
+        phases[i] = np.arctan2(a.imag, a.real)
+    return entropy, indices, probabilities, phases
 
 
 '''
@@ -94,140 +151,113 @@ class QuantumStateVector:
         logger.debug(f"Initialized QuantumStateVector: {self}")
 '''
 
+# liboqs releases the GIL while signing, so each pool thread keeps its own signer per secret key
+_signer_local = threading.local()
+
+
+def _thread_signer(secret_key: bytes) -> Signature:
+    """Lazily create this thread's Falcon signer for the given secret key."""
+    signers = getattr(_signer_local, 'signers', None)
+    if signers is None:
+        signers = _signer_local.signers = {}
+    signer = signers.get(secret_key)
+    if signer is None:
+        signer = signers[secret_key] = Signature("Falcon-512", secret_key)
+    return signer
+
+
+def _sign_chunk(secret_key: bytes, messages: List[bytes]) -> List[bytes]:
+    signer = _thread_signer(secret_key)
+    return [signer.sign(message) for message in messages]
+
+
 class ResultCache:
-    """Thread-safe cache for computation results."""
+    """Thread-safe LRU cache for computation results, bounded to exactly maxsize entries."""
 
     def __init__(self, maxsize: int = MAX_CACHE_SIZE):
-        self.cache = {}
+        # LRUCache reorders on hit and evicts the least recently used entry in O(1)
+        self.cache = LRUCache(maxsize=maxsize)
         self.maxsize = maxsize
         self.lock = threading.Lock()
-        self.access_times = {}
-        self.access_queue = deque()
 
     def get(self, key: str) -> Optional[Any]:
         with self.lock:
-            if key in self.cache:
-                self.access_times[key] = time.time()
-                self.access_queue.append(key)
-                return self.cache[key]
-        return None
+            return self.cache.get(key)
 
     def put(self, key: str, value: Any):
         with self.lock:
-            if len(self.cache) >= self.maxsize:
-                self._evict_oldest()
             self.cache[key] = value
-            self.access_times[key] = time.time()
-            self.access_queue.append(key)
-
-    def _evict_oldest(self):
-        while self.access_queue and len(self.cache) >= self.maxsize:
-            oldest_key = self.access_queue.popleft()
-            if oldest_key in self.cache:
-                del self.cache[oldest_key]
-                del self.access_times[oldest_key]
 
 
 
 
 class QuantumZKP:
-    def __init__(self, dimensions: int = 8, security_level: int = 128):
+    def __init__(self, dimensions: int = 8, security_level: int = 128, legacy_json: bool = False):
         set_cpu_affinity()
 
         self.dimensions = min(dimensions, MAX_VECTOR_SIZE)
         self.security_level = security_level
+        # Sign the canonical JSON form instead of the binary layout, for proofs from older nodes
+        self.legacy_json = legacy_json
         self._falcon = Signature("Falcon-512")
         self.public_key = self._falcon.generate_keypair()
+        # Batch signing rebuilds per-thread signers from this key, so every proof verifies against public_key
+        self._secret_key = self._falcon.export_secret_key()
 
         # Initialize caches and buffers
         self._result_cache = ResultCache()
+        # Signed proofs keyed by input vector and identifier, so re-proving a state skips hashing and signing
+        self._proof_cache = ResultCache(maxsize=PROOF_CACHE_SIZE)
         self._batch_buffer = queue.Queue()
         self._thread_local = threading.local()
+        self._use_gpu = os.environ.get(GPU_ENV_VAR) == "1" and _gpu_entropy_kernel() is not None
 
         logger.info(f"Initialized QuantumZKP with dimensions={dimensions}, "
-                    f"security_level={security_level}, GPU_enabled={USE_GPU}")
-
-    def _get_thread_local_hasher(self):
-        """Get or create thread-local hasher instance."""
-        if not hasattr(self._thread_local, 'hasher'):
-            self._thread_local.hasher = hashlib.sha3_256()
-        return self._thread_local.hasher
-
-    @staticmethod
-    @cuda.jit
-    def _gpu_calculate_entropy(amplitudes, result):
-        """GPU-accelerated entropy calculation."""
-        idx = cuda.grid(1)
-        if idx < amplitudes.size:
-            prob = abs(amplitudes[idx]) ** 2
-            if prob > ENTROPY_EPSILON:
-                result[idx] = -prob * np.log2(prob)
+                    f"security_level={security_level}, GPU_enabled={self._use_gpu}")
 
     def _calculate_entanglement_entropy(self, amplitudes: np.ndarray) -> float:
         """Calculate entropy using GPU if available, fallback to CPU."""
-        if USE_GPU and len(amplitudes) > 1000:
-            result = np.zeros_like(amplitudes, dtype=np.float64)
-            threadsperblock = 256
-            blockspergrid = (amplitudes.size + threadsperblock - 1) // threadsperblock
-            self._gpu_calculate_entropy[blockspergrid, threadsperblock](amplitudes, result)
-            return float(np.sum(result))
+        if self._use_gpu and len(amplitudes) > GPU_ENTROPY_THRESHOLD:
+            # One-element device accumulator per thread, allocated once and reset per call
+            out = getattr(self._thread_local, 'gpu_entropy', None)
+            if out is None:
+                out = self._thread_local.gpu_entropy = cuda.device_array(1, dtype=np.float64)
+            out[0] = 0.0
+            blockspergrid = (amplitudes.size + GPU_THREADS_PER_BLOCK - 1) // GPU_THREADS_PER_BLOCK
+            _gpu_entropy_kernel()[blockspergrid, GPU_THREADS_PER_BLOCK](amplitudes, out)
+            return float(out.copy_to_host()[0])
         else:
             return calculate_entropy(amplitudes)
 
-    @staticmethod
-    @njit(parallel=True, fastmath=True)
-    def _generate_measurements(state_coordinates: np.ndarray, security_level: int) -> List[Dict]:
-        """Vectorized measurement generation."""
-        num_measurements = security_level // 8
-        measurements = []
-
-        for i in prange(num_measurements):
-            idx = np.random.randint(0, len(state_coordinates))
-            amplitude = state_coordinates[idx]
-            probability = float(np.abs(amplitude) ** 2)
-            phase = float(np.angle(amplitude))
-
-            measurements.append({
-                'basis_index': idx,
-                'probability': probability,
-                'phase': phase
-            })
-
-        return measurements
-
     def _generate_commitment(self, state: QuantumStateVector, identifier: str) -> bytes:
-        """Thread-safe commitment generation."""
-        hasher = self._get_thread_local_hasher()
-        hasher.update(state.coordinates.tobytes())
-        hasher.update(str(state.coherence).encode())
-        hasher.update(identifier.encode())
-        commitment = hasher.digest()
-        hasher.clear()
-        return commitment
-
-    async def prove_vector_knowledge(self, vector: np.array, identifier: str) -> Tuple[bytes, Dict]:
-        """Asynchronous proof generation."""
-
+        """Thread-safe commitment generation: a fresh hasher over one pre-joined preimage."""
+        preimage = b''.join((state.coordinates.tobytes(), str(state.coherence).encode(), identifier.encode()))
+        return hashlib.sha3_256(preimage).digest()
 
+    def _build_unsigned_proof(self, vector: np.ndarray, identifier: str) -> Tuple[bytes, Dict, bytes]:
+        """Build a proof and the message its signature covers, leaving the signing to the caller."""
         # Create quantum state
         state = QuantumStateVector(vector)
         state.calculate_coherence()
 
-        # Calculate entropy and commitment
-        entropy = await asyncio.to_thread(self._calculate_entanglement_entropy, state.coordinates)
-        commitment = await asyncio.to_thread(self._generate_commitment, state, identifier)
-
-        # Generate measurements
-        measurements = await asyncio.to_thread(
-            self._generate_measurements,
-            state.coordinates,
-            self.security_level
+        # Entropy and measurement sampling share one pass over the amplitudes
+        seed = (int.from_bytes(os.urandom(8), 'little') >> 1) | 1
+        entropy, indices, probabilities, phases = _proof_kernel(
+            np.ascontiguousarray(state.coordinates, dtype=np.complex128),
+            seed,
+            self.security_level // 8
         )
+        commitment = self._generate_commitment(state, identifier)
+        measurements = np.empty(len(indices), dtype=LEGACY_MEASUREMENT_DTYPE if self.legacy_json else MEASUREMENT_DTYPE)
+        measurements['basis_index'] = indices
+        measurements['probability'] = probabilities
+        measurements['phase'] = phases
 
         # Create proof
         proof = {
+            'version': PROOF_FORMAT_VERSION,
             'quantum_dimensions': self.dimensions,
-            'basis_coefficients': state.coordinates,
+            'basis_coefficients': encode_coefficients(state.coordinates),
             'measurements': measurements,
             'state_metadata': {
                 'coherence': state.coherence,
@@ -236,17 +266,68 @@ class QuantumZKP:
             },
             'identifier': identifier
         }
+        return commitment, proof, self._prepare_message_for_signing(proof, commitment)
+
+    @staticmethod
+    def _proof_cache_key(vector: np.ndarray, identifier: str) -> str:
+        data = np.ascontiguousarray(vector)
+        return blake3.blake3(b''.join((data.dtype.str.encode(), data.tobytes(), identifier.encode()))).hexdigest()
+
+    def _cached_proof(self, key: str) -> Optional[Tuple[bytes, Dict]]:
+        cached = self._proof_cache.get(key)
+        if cached is None:
+            return None
+        commitment, proof = cached
+        # Callers get their own deep copy, so mutating the metadata or measurements of one result
+        # cannot leak into the cache or into another result
+        return commitment, copy.deepcopy(proof)
+
+    async def prove_vector_knowledge(self, vector: np.array, identifier: str) -> Tuple[bytes, Dict]:
+        """Asynchronous proof generation."""
+        cache_key = self._proof_cache_key(vector, identifier)
+        cached = self._cached_proof(cache_key)
+        if cached is not None:
+            return cached
+
+        commitment, proof, message = await asyncio.to_thread(self._build_unsigned_proof, vector, identifier)
 
         # Sign proof
-        message = await asyncio.to_thread(
-            self._prepare_message_for_signing,
-            proof,
-            commitment
-        )
         signature = await asyncio.to_thread(self._falcon.sign, message)
         proof['signature'] = signature.hex()
 
-        return commitment, proof
+        self._proof_cache.put(cache_key, (commitment, proof))
+        return commitment, copy.deepcopy(proof)
+
+    async def prove_vector_knowledge_batch(
+            self,
+            vectors: List[np.ndarray],
+            identifiers: List[str]
+    ) -> List[Tuple[bytes, Dict]]:
+        """Build every proof first, then sign the messages in one contiguous chunk per pool thread."""
+        keys = [self._proof_cache_key(v, i) for v, i in zip(vectors, identifiers)]
+        results: List[Optional[Tuple[bytes, Dict]]] = [self._cached_proof(key) for key in keys]
+        missing = [k for k, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        unsigned = await asyncio.to_thread(
+            lambda: [self._build_unsigned_proof(vectors[k], identifiers[k]) for k in missing]
+        )
+
+        messages = [message for _, _, message in unsigned]
+        chunk_size = -(-len(messages) // THREAD_COUNT)
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(THREAD_POOL, _sign_chunk, self._secret_key, messages[start:start + chunk_size])
+            for start in range(0, len(messages), chunk_size)
+        ))
+
+        signatures = (signature for chunk in chunks for signature in chunk)
+        for k, (commitment, proof, _), signature in zip(missing, unsigned, signatures):
+            proof['signature'] = signature.hex()
+            self._proof_cache.put(keys[k], (commitment, proof))
+            results[k] = (commitment, copy.deepcopy(proof))
+        return results
 
     def verify_proof(self, commitment: bytes, proof: Dict, identifier: str) -> bool:
         """Verify a single proof."""
@@ -268,11 +349,7 @@ class QuantumZKP:
                 return False
 
             # Verify basis coefficients
-            coefficients = np.array([
-                complex(c) if isinstance(c, (int, float))
-                else complex(c['real'], c['imag'])
-                for c in proof['basis_coefficients']
-            ])
+            coefficients = proof_coefficients(proof)
 
             if not self._verify_basis_coefficients(coefficients):
                 return False
@@ -294,12 +371,16 @@ class QuantumZKP:
         results = []
 
         def verify_batch(batch):
-            with THREAD_POOL as executor:
-                futures = [
-                    executor.submit(self.verify_proof, *item)
-                    for item in batch
-                ]
-                return [future.result() for future in concurrent.futures.as_completed(futures)]
+            # The pool is shared module state, so it is borrowed rather than shut down per batch;
+            # results are written back by position because as_completed yields in completion order
+            futures = {
+                THREAD_POOL.submit(self.verify_proof, *item): k
+                for k, item in enumerate(batch)
+            }
+            out = [False] * len(batch)
+            for future in concurrent.futures.as_completed(futures):
+                out[futures[future]] = future.result()
+            return out
 
         # Process in batches
         for i in range(0, len(commitments_proofs_ids), batch_size):
@@ -321,16 +402,15 @@ class QuantumZKP:
         return all(field in proof for field in required_fields)
 
     @staticmethod
-    @njit(parallel=True, fastmath=True)
     def _verify_basis_coefficients(coefficients: np.ndarray) -> bool:
-        """Vectorized coefficient verification."""
-        total = 0.0
-        for i in prange(len(coefficients)):
-            total += abs(coefficients[i]) ** 2
+        """Vectorized coefficient verification: the squared norm is a single BLAS dot product."""
+        total = float(np.vdot(coefficients, coefficients).real)
         return abs(total - 1.0) < PROBABILITY_TOLERANCE
 
     def _prepare_message_for_signing(self, proof: Dict, commitment: bytes) -> bytes:
         """Prepare message for signing."""
+        if not self.legacy_json:
+            return binary_signing_message(proof, commitment)
         proof_copy = {k: v for k, v in proof.items() if k != "signature"}
         message = json.dumps(
             proof_copy,
@@ -342,12 +422,15 @@ class QuantumZKP:
 
     @staticmethod
     def _complex_encoder(obj):
-        """JSON encoder for complex numbers."""
+        """JSON encoder for complex numbers, used by the legacy signing format."""
         if isinstance(obj, complex):
             return {'real': obj.real, 'imag': obj.imag}
         elif isinstance(obj, (np.integer, np.floating)):
             return float(obj)
         elif isinstance(obj, np.ndarray):
+            if obj.dtype.names:
+                # Record arrays keep the legacy list-of-dicts shape
+                return [dict(zip(obj.dtype.names, row)) for row in obj.tolist()]
             return obj.tolist()
         raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
 
@@ -4,74 +4,27 @@ import hashlib
 import logging
 import time
 from typing import Tuple, List, Dict
-from dataclasses import dataclass
 from oqs import Signature  # Requires 'oqs-python'
 from joblib import Parallel, delayed
-from numba import njit  # For performance optimization
+
+if __package__:
+    from .qzkp_core import LEGACY_MEASUREMENT_DTYPE, MEASUREMENT_DTYPE, QuantumStateVector, binary_signing_message, thread_rng
+else:
+    # Run as a standalone script from this directory
+    from qzkp_core import LEGACY_MEASUREMENT_DTYPE, MEASUREMENT_DTYPE, QuantumStateVector, binary_signing_message, thread_rng
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class QuantumStateVector:
-    """Represents a quantum state vector."""
-    coordinates: np.ndarray
-    entanglement: float
-    coherence: float
-    state_type: str = "SUPERPOSITION"
-    timestamp: float = 0.0
-
-    def __post_init__(self):
-        self.coordinates = self._normalize(self.coordinates)
-        self.coherence = self.calculate_coherence()
-        self.entanglement = self.calculate_entanglement()
-        self.timestamp = time.time()
-
-
-    def _normalize(self, vector: np.ndarray) -> np.ndarray:
-        """Normalizes the state vector."""
-        norm = np.linalg.norm(vector)
-        if norm > 0 :
-            return vector / norm
-        else:
-            logger.warning("Attempted to normalize a zero vector.")
-            return np.zeros_like(vector)
-
-    def calculate_coherence(self) -> float:
-        """Calculates the coherence of the state vector."""
-        return np.mean(np.abs(self.coordinates))
-
-    def calculate_entanglement(self) -> float:
-        """Calculates entanglement (currently simplified)."""
-        #In a real quantum system, entanglement calculation is much more complex.
-        #Here we use a proxy based on entropy.
-        return calculate_entropy(self.coordinates)
-
-
-    def serialize(self) -> bytes:
-        """Serializes the state vector to JSON."""
-        return json.dumps({
-            "coordinates": self.coordinates.tolist(),
-            "entanglement": self.entanglement,
-            "coherence": self.coherence,
-            "state_type": self.state_type,
-            "timestamp": self.timestamp
-        }, separators=(',', ':')).encode('utf-8')
-
-@njit
-def calculate_entropy(amplitudes: np.ndarray) -> float:
-    """Calculates the entropy of a probability distribution."""
-    probabilities = np.abs(amplitudes) ** 2
-    entropy = -np.sum(probabilities * np.log2(probabilities + 1e-10)) # Add small constant to avoid log(0)
-    return entropy
-
 class QuantumZKP:
     """Quantum-inspired Zero-Knowledge Proof system."""
-    def __init__(self, dimensions: int = 8, security_level: int = 128):
+    def __init__(self, dimensions: int = 8, security_level: int = 128, legacy_json: bool = False):
         self.dimensions = dimensions
         self.security_level = security_level
+        # Sign the canonical JSON form instead of the binary layout, for proofs from older nodes
+        self.legacy_json = legacy_json
         self._signature_scheme = Signature("Falcon-512") #Using Falcon signature scheme
         self.public_key = self._signature_scheme.generate_keypair()
         logger.info(f"Initialized QuantumZKP with dimensions={dimensions}, security_level={security_level}")
@@ -122,7 +75,7 @@ class QuantumZKP:
                 proof["quantum_dimensions"] == self.dimensions and \
                 proof["identifier"] == identifier
 
-    def _verify_measurements(self, basis_coefficients: List[complex], measurements: List[Dict]) -> bool:
+    def _verify_measurements(self, basis_coefficients: List[complex], measurements: np.ndarray) -> bool:
         """Verifies the consistency of measurements against basis coefficients."""
         # Implement measurement verification logic here
         # This is a placeholder,  a robust verification method would be needed based on the measurement generation.
@@ -130,18 +83,16 @@ class QuantumZKP:
         # Consider statistical tests of goodness-of-fit.
         return True
 
-    def _generate_measurements(self, state_coordinates: np.ndarray, security_level: int) -> List[Dict]:
+    def _generate_measurements(self, state_coordinates: np.ndarray, security_level: int) -> np.ndarray:
         """Generates simulated measurements."""
         num_measurements = min(security_level // 8, len(state_coordinates)) # Limit measurements to state size.
-        indices = np.random.choice(len(state_coordinates), num_measurements, replace=False)  #Sample without replacement
+        indices = thread_rng().choice(len(state_coordinates), num_measurements, replace=False, shuffle=False)  #Sample without replacement
         amplitudes = state_coordinates[indices]
-        probabilities = np.abs(amplitudes) ** 2
-        phases = np.angle(amplitudes)
-
-        return [
-            {"basis_index": int(idx), "probability": float(prob), "phase": float(phase)}
-            for idx, prob, phase in zip(indices, probabilities, phases)
-        ]
+        measurements = np.empty(num_measurements, dtype=LEGACY_MEASUREMENT_DTYPE if self.legacy_json else MEASUREMENT_DTYPE)
+        measurements["basis_index"] = indices
+        measurements["probability"] = amplitudes.real ** 2 + amplitudes.imag ** 2
+        measurements["phase"] = np.arctan2(amplitudes.imag, amplitudes.real)
+        return measurements
 
 
     def _generate_commitment(self, state: QuantumStateVector, identifier: str) -> bytes:
@@ -153,16 +104,21 @@ class QuantumZKP:
 
     def _prepare_message_for_signing(self, proof: dict, commitment: bytes) -> bytes:
         """Prepares the message for signing."""
+        if not self.legacy_json:
+            return binary_signing_message(proof, commitment)
         proof_copy = {k: v for k, v in proof.items() if k != "signature"}
         serialized_message = json.dumps(proof_copy, sort_keys=True, default=self._json_serializer).encode('utf-8')
         return serialized_message + commitment
 
 
     def _json_serializer(self, obj):
-        """Handles complex numbers and numpy arrays in JSON serialization."""
+        """Handles complex numbers and numpy arrays in the legacy JSON signing format."""
         if isinstance(obj, complex):
             return {"real": obj.real, "imag": obj.imag}
         if isinstance(obj, np.ndarray):
+            if obj.dtype.names:
+                # Record arrays keep the legacy list-of-dicts shape
+                return [dict(zip(obj.dtype.names, row)) for row in obj.tolist()]
             return obj.tolist()
         raise TypeError(f"Type {type(obj)} not serializable")
 
@@ -1,47 +1,37 @@
-import json
+import base64
 import numpy as np
+import orjson
 import hashlib
 import logging
+import os
+import tempfile
 import time
 from typing import Tuple, List, Dict
-from oqs import Signature
 from joblib import Parallel, delayed
-from numba import njit
 
-logging.basicConfig(level=logging.ERROR)
-logger = logging.getLogger(__name__)
-
-# Initialize Signature globally
-falcon_signature = Signature("Falcon-512")  # Only initialized once at the start
-
-
-@njit
-def adjust_to_square_length(vector: np.ndarray) -> np.ndarray:
-    target_length = int(np.ceil(np.sqrt(len(vector))) ** 2)
-    if len(vector) < target_length:
-        padded_vector = np.zeros(target_length, dtype=vector.dtype)
-        padded_vector[:len(vector)] = vector
-        return padded_vector
-    return vector
+if __package__:
+    from .qzkp_core import adjust_to_square_length, calculate_entropy, falcon_signer, thread_rng
+else:
+    # Run as a standalone script from this directory
+    from qzkp_core import adjust_to_square_length, calculate_entropy, falcon_signer, thread_rng
 
+logger = logging.getLogger(__name__)
 
-@njit
-def calculate_entropy(amplitudes: np.ndarray) -> float:
-    probabilities = np.abs(amplitudes) ** 2
-    entropy = -np.sum(probabilities * np.log2(probabilities + 1e-10))
-    return entropy
+# Vectors proved per worker task; workers read their rows from a shared memory-mapped batch
+PROOF_CHUNK_SIZE = 1000
+SHARED_MEMORY_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
 
 
 def generate_measurements(state_coordinates: np.ndarray, security_level: int) -> List[Dict]:
     num_measurements = security_level // 8
-    basis_indices = np.random.randint(0, len(state_coordinates), size=num_measurements)
+    basis_indices = thread_rng().integers(0, len(state_coordinates), size=num_measurements, dtype=np.int32)
     amplitudes = state_coordinates[basis_indices]
-    probabilities = np.abs(amplitudes) ** 2
-    phases = np.angle(amplitudes)
+    probabilities = amplitudes.real ** 2 + amplitudes.imag ** 2
+    phases = np.arctan2(amplitudes.imag, amplitudes.real)
 
     return [
-        {'basis_index': int(idx), 'probability': float(prob), 'phase': float(phase)}
-        for idx, prob, phase in zip(basis_indices, probabilities, phases)
+        {'basis_index': idx, 'probability': prob, 'phase': phase}
+        for idx, prob, phase in zip(basis_indices.tolist(), probabilities.tolist(), phases.tolist())
     ]
 
 
@@ -55,9 +45,9 @@ def generate_commitment(coordinates: np.ndarray, coherence: float, identifier: s
 
 def prepare_message_for_signing(proof: dict, commitment: bytes) -> bytes:
     proof_copy = {k: v for k, v in proof.items() if k != "signature"}
-    serialized_message = json.dumps(
-        proof_copy, sort_keys=True, default=complex_encoder, separators=(',', ':')
-    ).encode('utf-8')
+    serialized_message = orjson.dumps(
+        proof_copy, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY, default=complex_encoder
+    )
     return serialized_message + commitment
 
 
@@ -76,6 +66,11 @@ def complex_encoder(obj):
 def prove_vector_knowledge_worker(vector: np.ndarray, identifier: str, dimensions: int, security_level: int) -> Tuple[
     bytes, Dict]:
     vector = vector / np.linalg.norm(vector)
+    return prove_normalized_vector(vector, identifier, dimensions, security_level)
+
+
+def prove_normalized_vector(vector: np.ndarray, identifier: str, dimensions: int, security_level: int) -> Tuple[
+    bytes, Dict]:
     vector = adjust_to_square_length(vector)
 
     phase = np.zeros(len(vector))
@@ -88,7 +83,11 @@ def prove_vector_knowledge_worker(vector: np.ndarray, identifier: str, dimension
 
     proof = {
         'quantum_dimensions': dimensions,
-        'basis_coefficients': [complex(c) for c in coordinates],
+        # One base64 complex128 buffer; decode with np.frombuffer(..., dtype=np.complex128)
+        'basis_coefficients': {
+            'dtype': 'complex128',
+            'b64': base64.b64encode(np.ascontiguousarray(coordinates, dtype=np.complex128).tobytes()).decode('ascii')
+        },
         'measurements': measurements,
         'state_metadata': {
             'coherence': coherence,
@@ -99,13 +98,23 @@ def prove_vector_knowledge_worker(vector: np.ndarray, identifier: str, dimension
     }
     message = prepare_message_for_signing(proof, commitment)
 
-    # Use global falcon_signature to sign message
-    signature = falcon_signature.sign(message)
+    # Each worker thread signs with its own lazily created Falcon signer
+    signature = falcon_signer().sign(message)
     proof['signature'] = signature.hex()
 
     return commitment, proof
 
 
+def prove_vector_range(mmap_path: str, start: int, stop: int, identifiers: List[str], dimensions: int,
+                       security_level: int) -> List[Tuple[bytes, Dict]]:
+    # Rows were normalised in place before the batch was shared
+    vectors = np.load(mmap_path, mmap_mode='r')
+    return [
+        prove_normalized_vector(vectors[i], identifier, dimensions, security_level)
+        for i, identifier in zip(range(start, stop), identifiers)
+    ]
+
+
 class QuantumZKP:
     def __init__(self, dimensions: int = 8, security_level: int = 128):
         self.dimensions = dimensions
@@ -114,15 +123,39 @@ class QuantumZKP:
 
     def prove_vector_knowledge_batch(self, vectors: List[np.ndarray], identifiers: List[str]) -> List[
         Tuple[bytes, Dict]]:
-        results = Parallel(n_jobs=-1, batch_size=10)(
-            delayed(prove_vector_knowledge_worker)(vector, identifier, self.dimensions, self.security_level)
-            for vector, identifier in zip(vectors, identifiers)
-        )
-        return results
+        if not vectors:
+            return []
+        length = len(vectors[0])
+        if any(len(vector) != length for vector in vectors):
+            # Only equal-length vectors stack into one shared matrix; mixed sizes go one by one
+            return Parallel(n_jobs=-1, batch_size=10)(
+                delayed(prove_vector_knowledge_worker)(vector, identifier, self.dimensions, self.security_level)
+                for vector, identifier in zip(vectors, identifiers)
+            )
+
+        # Write the batch once to a memory-mapped file so process workers read rows without pickling them
+        n = len(vectors)
+        with tempfile.TemporaryDirectory(dir=SHARED_MEMORY_DIR) as tmp:
+            mmap_path = os.path.join(tmp, 'vectors.npy')
+            shared = np.lib.format.open_memmap(mmap_path, mode='w+', dtype=np.float64, shape=(n, length))
+            shared[:] = vectors
+            # Normalise every row at once instead of one np.linalg.norm call per vector
+            shared /= np.sqrt(np.einsum('ij,ij->i', shared, shared))[:, None]
+            shared.flush()
+            del shared
+
+            chunks = Parallel(n_jobs=-1, backend='loky')(
+                delayed(prove_vector_range)(mmap_path, start, min(start + PROOF_CHUNK_SIZE, n),
+                                            identifiers[start:start + PROOF_CHUNK_SIZE],
+                                            self.dimensions, self.security_level)
+                for start in range(0, n, PROOF_CHUNK_SIZE)
+            )
+        return [result for chunk in chunks for result in chunk]
 
 
 # Performance testing code
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.ERROR)
     zk_proof_system = QuantumZKP()
     num_vectors = 100000  # Increased for more testing
     vector_size = 8
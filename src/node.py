@@ -118,4 +118,11 @@ async def main():
 if __name__ == '__main__':
     import asyncio
 
+    # The gRPC server and vector node must run on this policy; fall back to the stock loop without uvloop
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     asyncio.run(main(), debug=True)
\ No newline at end of file
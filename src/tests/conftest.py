@@ -0,0 +1,13 @@
+import logging
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def configure_logging():
+    # Configure logging to show info messages, once for the whole session rather than per test module
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        force=True
+    )
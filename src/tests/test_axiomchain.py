@@ -1,60 +1,59 @@
-import socket
+import asyncio
+import os
 
 import pytest
+import pytest_asyncio
 import logging
 from src.modules.vectorchain import AxiomChain
 
-# Configure logging to show info messages
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    force=True
-)
-
 logger = logging.getLogger(__name__)
 
-def get_local_ip():
+# Address the test node binds to; loopback by default so setup never depends on outbound network access
+BIND_IP = os.environ.get("AXIOM_TEST_BIND") or "127.0.0.1"
+
+# Tests share the session loop that the chain fixture was started on
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    # The chain is socket-heavy, so run the session loop on libuv; fall back to the stock loop without uvloop
     try:
-        # Create a socket object
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        # Connect to an external server (doesn't actually send any data)
-        s.connect(('8.8.8.8', 80))
-        # Get the local IP address
-        local_ip = s.getsockname()[0]
-        s.close()
-        return local_ip
-    except Exception:
-        return '127.0.0.1'
-
-
-@pytest.fixture(autouse=True)
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
 async def event_emitter_cleanup():
     yield
-    # This will run after each test
+    # Emitters are shared by the session chain, so close them once after the last test
     await cleanup_sessions()
 
 
 async def cleanup_sessions():
     from src.modules.events_module.event_emitter import EventEmitter
-    emitter = EventEmitter()
-    await emitter.cleanup()
+    await asyncio.gather(*(emitter.cleanup() for emitter in EventEmitter.instances()))
 
 
-@pytest.mark.asyncio
-async def test_chain():
-    chain = AxiomChain()
+@pytest_asyncio.fixture(scope="session")
+async def chain():
+    # Node initialization and genesis are paid once per session rather than once per test
+    c = AxiomChain()
     try:
-        identity = await chain.initialize_node('216.209.218.112')
-        logger.info(f"Node initialized with: {identity}")
+        identity = await c.initialize_node(BIND_IP)
+        logger.info("Node initialized with: %s", identity)
+        await c.start()
+        logger.info("Chain started successfully")
+        yield c
+    finally:
+        # Setup errors propagate so dependent tests error out instead of running on a half-started chain
+        if c.is_running():
+            await c.stop()
 
-        await chain.start()
-        logger.info(f"Chain started successfully")
-        logger.info(f"Node Identity: {chain.get_identity()}")
 
-        return True
-    except Exception as e:
-        logger.error(f"Test failed: {e}")
-        return False
-    finally:
-        if chain:
-            await chain.stop()
\ No newline at end of file
+async def test_chain(chain):
+    identity = chain.get_identity()
+    logger.info("Node Identity: %s", identity)
+    assert identity
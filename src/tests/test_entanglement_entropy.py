@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from src.modules.multiverse.entanglement.entanglement_entropy import EntanglementEntropy
+
+
+def _density_matrices(batch, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    factors = rng.standard_normal((batch, dim, dim))
+    matrices = factors @ np.swapaxes(factors, -1, -2)
+    # A pure state is rank one, so most of its eigenvalues sit on the regularization floor
+    pure = rng.standard_normal(dim)
+    matrices[0] = np.outer(pure, pure)
+    return matrices / np.trace(matrices, axis1=-2, axis2=-1)[:, np.newaxis, np.newaxis]
+
+
+def test_batched_entropies_match_per_matrix_entropy():
+    entropy = EntanglementEntropy()
+    stack = _density_matrices(batch=6, dim=4)
+
+    batched = entropy.calculate_entropies(stack)
+
+    assert batched.shape == (6,)
+    assert batched.tolist() == pytest.approx([entropy.calculate_entropy(m) for m in stack])
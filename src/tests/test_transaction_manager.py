@@ -0,0 +1,23 @@
+import os
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from src.modules.transaction_module.transaction_manager import GCM_IV_SIZE, GCM_TAG_SIZE, TransactionManager
+
+
+def test_encrypted_data_is_iv_tag_ciphertext():
+    # Encryption needs no IPFS/NATS clients, so skip __init__
+    manager = TransactionManager.__new__(TransactionManager)
+    key = os.urandom(32)
+    plaintext = b"transaction payload"
+
+    encrypted = manager._encrypt_data(plaintext, key)
+
+    assert len(encrypted) == GCM_IV_SIZE + GCM_TAG_SIZE + len(plaintext)
+    assert manager._decrypt_data(encrypted, key) == plaintext
+
+    # Decrypt independently from the documented IV || tag || ciphertext layout
+    iv = encrypted[:GCM_IV_SIZE]
+    tag = encrypted[GCM_IV_SIZE:GCM_IV_SIZE + GCM_TAG_SIZE]
+    cipher_text = encrypted[GCM_IV_SIZE + GCM_TAG_SIZE:]
+    assert AESGCM(key).decrypt(iv, cipher_text + tag, None) == plaintext
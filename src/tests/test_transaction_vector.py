@@ -0,0 +1,29 @@
+import numpy as np
+
+from src.modules.vector_module.transaction_vector import TransactionVector
+
+
+def test_ndarray_layer_keeps_dtype_and_shape():
+    vector = TransactionVector()
+    coordinates = np.arange(12, dtype=np.float32).reshape(3, 4)
+    counters = np.array([1, 2, 3], dtype=np.int16)
+
+    vector.add_layer("coordinates", coordinates)
+    vector.add_layer("counters", counters)
+
+    for name, original in (("coordinates", coordinates), ("counters", counters)):
+        restored = vector.get_layer(name)
+        assert restored.dtype == original.dtype
+        assert restored.shape == original.shape
+        np.testing.assert_array_equal(restored, original)
+
+
+def test_dict_layer_round_trip():
+    vector = TransactionVector()
+    state = {"status": "pending", "amount": 42, "weights": [0.5, 0.25], "meta": {"raw": b"\x00\x01"}}
+
+    vector.add_layer("state", state)
+
+    assert vector.get_layer("state") == state
+    assert vector.get_all_layers() == {"state": state}
+    assert vector.get_layer("missing") is None
@@ -0,0 +1,37 @@
+import pytest
+
+from src.modules.trust_module.trust_manager import TrustManager
+
+NODES = {
+    "fresh": {},
+    "steady": {"uptime": 0.99, "latency": 0.05, "age": 12.0, "peer_recognition": 0.8, "stability": 0.9},
+    "veteran": {"uptime": 0.7, "latency": 0.3, "age": 120.0, "peer_recognition": 0.4, "stability": 0.6},
+    "failing": {"uptime": 0.0, "latency": 6.0, "age": 0.5, "peer_recognition": 0.0, "stability": 0.0},
+}
+
+
+def test_vectorized_scores_match_scalar_scores():
+    manager = TrustManager()
+    node_data = list(NODES.values())
+
+    scores = manager.calculate_trust_scores(
+        [d.get("uptime", 0.0) for d in node_data],
+        [d.get("latency", 1.0) for d in node_data],
+        [d.get("age", 0.0) for d in node_data],
+        [d.get("peer_recognition", 0.0) for d in node_data],
+        [d.get("stability", 0.0) for d in node_data],
+    )
+
+    assert scores.tolist() == pytest.approx([manager.calculate_trust_score(d) for d in node_data])
+
+
+def test_batch_update_matches_per_node_update():
+    batched, single = TrustManager(), TrustManager()
+
+    batched.update_trust_scores(NODES)
+    for node_id, data in NODES.items():
+        single.update_trust_score(node_id, data)
+
+    assert batched.node_trust_scores == pytest.approx(single.node_trust_scores)
+    # The failing node scores below zero and is banned on both paths
+    assert batched.get_trust_score("failing") == -1.0
@@ -0,0 +1,36 @@
+import numpy as np
+
+from src.modules.transaction_module.transaction_manager import TransactionManager
+from src.modules.zkp.qzkp_core import proof_coefficients
+from src.modules.zkp.qzkp_optimized import QuantumZKP
+
+
+async def test_proof_survives_msgpack_round_trip():
+    zkp = QuantumZKP()
+    commitment, proof = await zkp.prove_vector_knowledge(np.arange(1.0, 9.0), "tx-roundtrip")
+
+    # Pack and unpack the proof the way stored transactions do, skipping the IPFS/NATS setup
+    manager = TransactionManager.__new__(TransactionManager)
+    restored = manager._unpack(manager._pack({"proof": proof}))["proof"]
+
+    assert isinstance(restored["measurements"], list)
+    assert zkp.verify_proof(commitment, restored, "tx-roundtrip")
+
+
+async def test_v1_and_v2_proofs_both_verify():
+    zkp = QuantumZKP()
+    vector = np.arange(1.0, 9.0)
+    commitment_v2, proof_v2 = await zkp.prove_vector_knowledge(vector, "tx-v2")
+    assert proof_v2["version"] == 2 and "b64" in proof_v2["basis_coefficients"]
+
+    # An older node's proof: no b64 buffer, each coefficient listed as a {'real', 'imag'} dict
+    commitment_v1, proof_v1 = await zkp.prove_vector_knowledge(vector, "tx-v1")
+    proof_v1["version"] = 1
+    proof_v1["basis_coefficients"] = [
+        {"real": c.real, "imag": c.imag} for c in proof_coefficients(proof_v1).tolist()
+    ]
+    proof_v1["signature"] = zkp._falcon.sign(zkp._prepare_message_for_signing(proof_v1, commitment_v1)).hex()
+
+    np.testing.assert_array_equal(proof_coefficients(proof_v1), proof_coefficients(proof_v2))
+    assert zkp.verify_proof(commitment_v2, proof_v2, "tx-v2")
+    assert zkp.verify_proof(commitment_v1, proof_v1, "tx-v1")